@@ -5,36 +5,107 @@ Tries multiple methods to extract tokens from existing sessions
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import webbrowser
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
 import re
 from urllib.parse import urlparse, parse_qs
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# requests can only decode Brotli bodies when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# JWT with bounded segment lengths, so long base64-ish runs in minified JS cannot blow up the scan
+_JWT = r'eyJ[A-Za-z0-9_-]{10,4096}\.[A-Za-z0-9_-]{10,4096}\.[A-Za-z0-9_.+/=-]{10,4096}'
+
+# All token patterns fused into one alternation so a response body is scanned once
+_TOKEN_RE = re.compile(
+    r'(?P<jwt>' + _JWT + r')'
+    r'|"(?:accessToken|token|bearer)"\s*:\s*"(?P<kv>[^"]+)"'
+    r'|Bearer\s+(?P<bear>' + _JWT + r')'
+    r'|(?:local|session)Storage\.setItem\(["\'](?P<key>[^"\']+)["\'],\s*["\'](?P<value>[^"\']+)["\']\)'
+)
+
+# Common token cookie names
+_TOKEN_COOKIE_NAMES = frozenset((
+    'feathers-jwt',
+    'access_token',
+    'jwt_token',
+    'auth_token',
+    'savanna_token',
+    'okta_token',
+    'bearer_token',
+))
+
+# Content types worth scanning for tokens
+_TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/xml', 'application/javascript')
+
+# Response bodies are scanned in chunks; the overlap covers the longest JWT _JWT accepts
+_STREAM_CHUNK_SIZE = 64 * 1024
+_STREAM_OVERLAP = 16 * 1024
 
 class AggressiveTokenExtractor:
     """Aggressive token extraction using multiple methods"""
     
+    # Endpoints probed by _try_multiple_endpoints
+    ENDPOINTS = (
+        "/creative-pulling",
+        "/",
+        "/dashboard",
+        "/home",
+        "/api/creative-pulling",
+        "/api/creatives",
+        "/oauth/okta/callback",
+        "/authentication",
+    )
+    
     def __init__(self):
         self.session = requests.Session()
         self.savanna_base_url = "https://savanna.fyber.com"
         
+        # Full URLs built once; the probe loops reuse them on every call
+        self._main_url = f"{self.savanna_base_url}/"
+        self._creative_pulling_url = f"{self.savanna_base_url}/creative-pulling"
+        self._endpoint_urls = tuple(
+            (endpoint, f"{self.savanna_base_url}{endpoint}") for endpoint in self.ENDPOINTS
+        )
+        
         # Set realistic browser headers
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
+            'Referer': self._main_url,
         })
+        
+        # Keep-alive pool so every probe reuses the same TLS connection
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-run memo of responses by (URL, follow redirects) and of the token each response yielded
+        self._response_cache: Dict[Tuple[str, bool], requests.Response] = {}
+        self._response_tokens: Dict[requests.Response, Optional[str]] = {}
+        self._response_etags: Dict[requests.Response, Tuple[Tuple[str, bool], str]] = {}
+        
+        # ETag of each page's last scanned 200 and the token found in that body, kept
+        # across runs so an unchanged page comes back as a bodyless 304
+        self._etag_tokens: Dict[Tuple[str, bool], Tuple[str, Optional[str]]] = {}
     
     def extract_token_aggressive(self) -> Optional[str]:
         """Try multiple aggressive methods to extract token"""
@@ -67,62 +138,66 @@ class AggressiveTokenExtractor:
         except Exception as e:
             logger.error(f"❌ Aggressive extraction failed: {e}")
             return None
+        finally:
+            # Snapshot: abandoned endpoint probes may still be adding responses
+            for response in list(self._response_cache.values()):
+                response.close()
+            self._response_cache.clear()
+            self._response_tokens.clear()
+            self._response_etags.clear()
+    
+    def _get(self, url: str, timeout: float = 10, allow_redirects: bool = True) -> requests.Response:
+        """GET a URL once per extraction run; later methods reuse the first response.
+
+        Keyed on allow_redirects too: a no-redirect probe must see the 3xx itself,
+        not the page a redirect-following fetch landed on.
+        """
+        key = (url, allow_redirects)
+        response = self._response_cache.get(key)
+        if response is None:
+            cached = self._etag_tokens.get(key)
+            headers = {'If-None-Match': cached[0]} if cached else None
+            response = self.session.get(
+                url, headers=headers, timeout=timeout, stream=True, allow_redirects=allow_redirects
+            )
+            if response.status_code == 304 and cached:
+                # Unchanged since the last scan: reuse its token and stand in for the
+                # 200 the 304 confirms, so callers need no separate branch for it
+                response.status_code = 200
+                self._response_tokens[response] = cached[1]
+            elif response.status_code == 200 and response.headers.get('ETag'):
+                self._response_etags[response] = (key, response.headers['ETag'])
+            self._response_cache[key] = response
+        return response
     
     def _try_direct_access(self) -> Optional[str]:
         """Try direct access with various approaches"""
         try:
             logger.info("🎯 Method 1: Direct page access...")
             
-            # Try 1: Basic GET request
-            response = self.session.get(
-                f"{self.savanna_base_url}/creative-pulling",
-                timeout=10,
-                allow_redirects=True
-            )
+            # Warm up cookies on the main page; it may already carry the token
+            main_response = self._get(self._main_url)
             
-            logger.info(f"Response status: {response.status_code}")
-            logger.info(f"Response URL: {response.url}")
+            logger.debug("Main page status: %s", main_response.status_code)
             
-            if response.status_code == 200:
-                # Extract token from response
-                token = self._extract_token_from_response(response)
+            if main_response.status_code == 200:
+                token = self._extract_token_from_response(main_response)
                 if token:
                     logger.info("✅ Token found via direct access!")
                     return token
             
-            # Try 2: With referer header
-            self.session.headers.update({'Referer': 'https://savanna.fyber.com/'})
-            response = self.session.get(
-                f"{self.savanna_base_url}/creative-pulling",
-                timeout=10,
-                allow_redirects=True
-            )
+            # Then the protected page, with the Referer already on the session
+            response = self._get(self._creative_pulling_url)
+            
+            logger.debug("Response status: %s", response.status_code)
+            logger.debug("Response URL: %s", response.url)
             
             if response.status_code == 200:
                 token = self._extract_token_from_response(response)
                 if token:
+                    logger.info("✅ Token found via direct access!")
                     return token
             
-            # Try 3: Access main page first
-            main_response = self.session.get(
-                f"{self.savanna_base_url}/",
-                timeout=10,
-                allow_redirects=True
-            )
-            
-            if main_response.status_code == 200:
-                # Now try creative-pulling
-                response = self.session.get(
-                    f"{self.savanna_base_url}/creative-pulling",
-                    timeout=10,
-                    allow_redirects=True
-                )
-                
-                if response.status_code == 200:
-                    token = self._extract_token_from_response(response)
-                    if token:
-                        return token
-            
             return None
             
         except Exception as e:
@@ -134,47 +209,20 @@ class AggressiveTokenExtractor:
         try:
             logger.info("🔍 Method 2: Trying multiple endpoints...")
             
-            endpoints_to_try = [
-                "/creative-pulling",
-                "/",
-                "/dashboard",
-                "/home",
-                "/api/creative-pulling",
-                "/api/creatives",
-                "/oauth/okta/callback",
-                "/authentication"
-            ]
-            
-            for endpoint in endpoints_to_try:
-                try:
-                    logger.info(f"   Trying: {endpoint}")
-                    response = self.session.get(
-                        f"{self.savanna_base_url}{endpoint}",
-                        timeout=10,
-                        allow_redirects=True
-                    )
-                    
-                    logger.info(f"      Status: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        # Extract token from response
-                        token = self._extract_token_from_response(response)
-                        if token:
-                            logger.info(f"✅ Token found via endpoint: {endpoint}")
-                            return token
-                        
-                        # Check cookies
-                        token = self._extract_token_from_cookies()
-                        if token:
-                            logger.info(f"✅ Token found in cookies via endpoint: {endpoint}")
-                            return token
-                    
-                    # Small delay between requests
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.warning(f"      Error with {endpoint}: {e}")
-                    continue
+            # Fan the probes out; the first endpoint that yields a token wins.
+            # No `with`: its exit would wait for probes still in flight.
+            executor = ThreadPoolExecutor(max_workers=4)
+            try:
+                futures = [
+                    executor.submit(self._probe_endpoint, endpoint, url)
+                    for endpoint, url in self._endpoint_urls
+                ]
+                for future in as_completed(futures):
+                    token = future.result()
+                    if token:
+                        return token
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
             
             return None
             
@@ -182,6 +230,47 @@ class AggressiveTokenExtractor:
             logger.error(f"❌ Multiple endpoints failed: {e}")
             return None
     
+    def _probe_endpoint(self, endpoint: str, url: str) -> Optional[str]:
+        """Fetch a single endpoint and look for a token in its body or cookies"""
+        try:
+            logger.debug("   Trying: %s", endpoint)
+            
+            # Cheap HEAD first; only pull the body when the page is actually served to us.
+            # Skipped when an earlier method already fetched the URL.
+            if (url, True) not in self._response_cache:
+                head = self.session.head(url, timeout=5, allow_redirects=True)
+                if head.status_code != 405 and (head.status_code != 200 or self._is_login_redirect(head)):
+                    logger.debug("      HEAD %s: %s, skipping", endpoint, head.status_code)
+                    return None
+            
+            response = self._get(url)
+            
+            logger.debug("      Status %s: %s", endpoint, response.status_code)
+            
+            if response.status_code == 200:
+                # Extract token from response
+                token = self._extract_token_from_response(response)
+                if token:
+                    logger.info(f"✅ Token found via endpoint: {endpoint}")
+                    return token
+                
+                # Check cookies
+                token = self._extract_token_from_cookies()
+                if token:
+                    logger.info(f"✅ Token found in cookies via endpoint: {endpoint}")
+                    return token
+            
+            return None
+            
+        except Exception as e:
+            logger.warning(f"      Error with {endpoint}: {e}")
+            return None
+    
+    def _is_login_redirect(self, response) -> bool:
+        """Check whether a response ended up on the login page"""
+        final_url = response.url.lower()
+        return "login" in final_url or "okta" in final_url
+    
     def _simulate_browser_navigation(self) -> Optional[str]:
         """Simulate browser navigation flow"""
         try:
@@ -189,16 +278,12 @@ class AggressiveTokenExtractor:
             
             # Step 1: Access main page
             logger.info("   Step 1: Accessing main page...")
-            main_response = self.session.get(
-                f"{self.savanna_base_url}/",
-                timeout=10,
-                allow_redirects=True
-            )
+            main_response = self._get(self._main_url)
             
-            logger.info(f"   Main page status: {main_response.status_code}")
+            logger.debug("   Main page status: %s", main_response.status_code)
             
             # Step 2: Check if we got redirected to login
-            if "login" in main_response.url.lower() or "okta" in main_response.url.lower():
+            if self._is_login_redirect(main_response):
                 logger.info("   Redirected to login page, checking for tokens...")
                 token = self._extract_token_from_response(main_response)
                 if token:
@@ -206,13 +291,9 @@ class AggressiveTokenExtractor:
             
             # Step 3: Try to access a protected resource
             logger.info("   Step 2: Trying protected resource...")
-            protected_response = self.session.get(
-                f"{self.savanna_base_url}/creative-pulling",
-                timeout=10,
-                allow_redirects=True
-            )
+            protected_response = self._get(self._creative_pulling_url)
             
-            logger.info(f"   Protected resource status: {protected_response.status_code}")
+            logger.debug("   Protected resource status: %s", protected_response.status_code)
             
             if protected_response.status_code == 200:
                 token = self._extract_token_from_response(protected_response)
@@ -221,7 +302,7 @@ class AggressiveTokenExtractor:
             
             # Step 4: Check if we got a different response
             if protected_response.status_code != 200:
-                logger.info(f"   Got status {protected_response.status_code}, checking response...")
+                logger.debug("   Got status %s, checking response...", protected_response.status_code)
                 token = self._extract_token_from_response(protected_response)
                 if token:
                     return token
@@ -240,33 +321,32 @@ class AggressiveTokenExtractor:
             # Try to access with session cookies
             logger.info("   Checking session cookies...")
             
-            # List all cookies we have
-            cookies = self.session.cookies
-            logger.info(f"   Found {len(cookies)} cookies:")
-            for cookie in cookies:
-                logger.info(f"      {cookie.name}: {cookie.value[:50]}...")
+            # List all cookies we have; only worth walking the jar when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                cookies = self.session.cookies
+                logger.debug("   Found %d cookies:", len(cookies))
+                for cookie in cookies:
+                    logger.debug("      %s: %s...", cookie.name, (cookie.value or '')[:50])
             
-            # Try to access with existing cookies
-            response = self.session.get(
-                f"{self.savanna_base_url}/creative-pulling",
-                timeout=10,
-                allow_redirects=True
-            )
+            # Quick no-redirect probe: a redirect only leads to the Okta login page,
+            # so on 3xx go straight to the cookies instead of chasing it
+            response = self._get(self._creative_pulling_url, timeout=5, allow_redirects=False)
             
-            logger.info(f"   Session check status: {response.status_code}")
+            logger.debug("   Session check status: %s", response.status_code)
             
             if response.status_code == 200:
                 token = self._extract_token_from_response(response)
                 if token:
                     return token
+            elif response.is_redirect:
+                token = self._extract_token_from_cookies()
+                if token:
+                    return token
             
             # Try authentication endpoint
-            auth_response = self.session.get(
-                f"{self.savanna_base_url}/authentication",
-                timeout=10
-            )
+            auth_response = self._get(f"{self.savanna_base_url}/authentication")
             
-            logger.info(f"   Auth endpoint status: {auth_response.status_code}")
+            logger.debug("   Auth endpoint status: %s", auth_response.status_code)
             
             if auth_response.status_code == 200:
                 token = self._extract_token_from_response(auth_response)
@@ -280,78 +360,81 @@ class AggressiveTokenExtractor:
             return None
     
     def _extract_token_from_response(self, response) -> Optional[str]:
-        """Extract token from HTTP response"""
+        """Extract token from HTTP response, scanning each body only once"""
+        if response not in self._response_tokens:
+            token = self._scan_response(response)
+            self._response_tokens[response] = token
+            if response in self._response_etags:
+                key, etag = self._response_etags.pop(response)
+                self._etag_tokens[key] = (etag, token)
+        return self._response_tokens[response]
+    
+    def _scan_response(self, response) -> Optional[str]:
+        """Scan a streamed response body for a token as it arrives"""
         try:
-            # Look for token in response text
-            text = response.text
-            
-            # Pattern 1: JWT token in script tags
-            jwt_pattern = r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*'
-            jwt_matches = re.findall(jwt_pattern, text)
-            
-            for match in jwt_matches:
-                if len(match) > 100:  # Likely a real JWT
-                    logger.info(f"🔍 Found JWT token in response: {match[:20]}...")
-                    return match
-            
-            # Pattern 2: Token in localStorage or similar
-            token_patterns = [
-                r'"accessToken"\s*:\s*"([^"]+)"',
-                r'"token"\s*:\s*"([^"]+)"',
-                r'"bearer"\s*:\s*"([^"]+)"',
-                r'Bearer\s+([A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*)',
-                r'localStorage\.setItem\(["\']([^"\']+)["\'],\s*["\']([^"\']+)["\']\)',
-                r'sessionStorage\.setItem\(["\']([^"\']+)["\'],\s*["\']([^"\']+)["\']\)'
-            ]
-            
-            for pattern in token_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        # Handle localStorage/sessionStorage patterns
-                        for item in match:
-                            if item.startswith('eyJ') and len(item) > 100:
-                                logger.info(f"🔍 Found token in storage: {item[:20]}...")
-                                return item
-                    elif match.startswith('eyJ') and len(match) > 100:
-                        logger.info(f"🔍 Found token with pattern: {match[:20]}...")
-                        return match
+            # Don't decode images and other binary bodies just to run the regex over them
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and not any(t in content_type for t in _TEXT_CONTENT_TYPES):
+                return None
             
-            return None
+            if response.encoding is None:
+                response.encoding = 'utf-8'
+            
+            # Keep a tail of the previous chunk so tokens split across chunks still match
+            window = ''
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE, decode_unicode=True):
+                window = window[-_STREAM_OVERLAP:] + chunk
+                token = self._find_token(window, complete=False)
+                if token:
+                    return token
+            
+            # Matches touching the end of the last window were deferred; check them now
+            return self._find_token(window)
             
         except Exception as e:
             logger.error(f"❌ Error extracting token from response: {e}")
             return None
+        finally:
+            response.close()
+    
+    def _find_token(self, text: str, complete: bool = True) -> Optional[str]:
+        """Find the first plausible token in text
+        
+        With complete=False, text is a window onto a stream and a match that runs
+        to its end may be truncated, so it is left for the next window.
+        """
+        # Every token we accept starts with 'eyJ'; skip the regex when it is absent
+        if 'eyJ' not in text:
+            return None
+        
+        # JWTs, "token" JSON fields, Bearer headers and storage calls in one pass
+        for match in _TOKEN_RE.finditer(text):
+            if not complete and match.end() == len(text):
+                continue
+            for value in match.groups():
+                if value and value.startswith('eyJ') and len(value) > 100:  # Likely a real JWT
+                    logger.info(f"🔍 Found token in response ({match.lastgroup}): {value[:20]}...")
+                    return value
+        
+        return None
     
     def _extract_token_from_cookies(self) -> Optional[str]:
         """Extract token from cookies"""
         try:
-            cookies = self.session.cookies
-            
-            # Look for common token cookie names
-            token_cookies = [
-                'feathers-jwt',
-                'access_token',
-                'jwt_token',
-                'auth_token',
-                'savanna_token',
-                'okta_token',
-                'bearer_token'
-            ]
-            
-            for cookie_name in token_cookies:
-                if cookie_name in cookies:
-                    cookie_value = cookies[cookie_name]
-                    if cookie_value.startswith('eyJ') and len(cookie_value) > 100:
-                        logger.info(f"🔍 Found token in cookie {cookie_name}: {cookie_value[:20]}...")
-                        return cookie_value
-            
-            # Check all cookies for JWT patterns
-            for cookie in cookies:
-                cookie_value = cookie.value
-                if cookie_value.startswith('eyJ') and len(cookie_value) > 100:
-                    logger.info(f"🔍 Found JWT in cookie {cookie.name}: {cookie_value[:20]}...")
+            # One pass over the jar: a known token cookie wins, any other JWT is a fallback
+            fallback = None
+            for cookie_name, cookie_value in self.session.cookies.get_dict().items():
+                if not (cookie_value and cookie_value.startswith('eyJ') and len(cookie_value) > 100):
+                    continue
+                if cookie_name in _TOKEN_COOKIE_NAMES:
+                    logger.info(f"🔍 Found token in cookie {cookie_name}: {cookie_value[:20]}...")
                     return cookie_value
+                if fallback is None:
+                    fallback = (cookie_name, cookie_value)
+            
+            if fallback:
+                logger.info(f"🔍 Found JWT in cookie {fallback[0]}: {fallback[1][:20]}...")
+                return fallback[1]
             
             return None
             
@@ -391,8 +474,9 @@ class AggressiveTokenExtractor:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(
-                f"{self.savanna_base_url}/creative-pulling",
+            # Reuse the pooled session connection rather than a fresh handshake
+            response = self.session.get(
+                self._creative_pulling_url,
                 headers=test_headers,
                 timeout=10
             )
@@ -432,5 +516,6 @@ def main():
     print("\n✨ Test complete!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
 
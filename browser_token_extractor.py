@@ -5,18 +5,52 @@ Extracts fresh tokens from active browser sessions without requiring OAuth2 cred
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import webbrowser
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
 from datetime import datetime, timedelta
 import re
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# requests can only decode Brotli bodies when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# JWT with bounded segment lengths, so long base64-ish runs in minified JS cannot blow up the scan
+_JWT = r'eyJ[A-Za-z0-9_-]{10,4096}\.[A-Za-z0-9_-]{10,4096}\.[A-Za-z0-9_.+/=-]{10,4096}'
+
+# All token patterns fused into one alternation so a response body is scanned once
+_TOKEN_RE = re.compile(
+    r'(?P<jwt>' + _JWT + r')'
+    r'|"(?:accessToken|token|bearer)"\s*:\s*"(?P<kv>[^"]+)"'
+    r'|Bearer\s+(?P<bear>' + _JWT + r')'
+)
+
+# Common token cookie names
+_TOKEN_COOKIE_NAMES = frozenset((
+    'feathers-jwt',
+    'access_token',
+    'jwt_token',
+    'auth_token',
+    'savanna_token',
+))
+
+# Content types worth scanning for tokens
+_TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/xml', 'application/javascript')
+
+# Response bodies are scanned in chunks; the overlap covers the longest JWT _JWT accepts
+_STREAM_CHUNK_SIZE = 64 * 1024
+_STREAM_OVERLAP = 16 * 1024
 
 class BrowserTokenExtractor:
     """Extract tokens from browser sessions"""
@@ -25,17 +59,27 @@ class BrowserTokenExtractor:
         self.session = requests.Session()
         self.savanna_base_url = "https://savanna.fyber.com"
         self.okta_base_url = "https://digitalturbine.okta.com"
+        self._creative_pulling_url = f"{self.savanna_base_url}/creative-pulling"
+        
+        # ETag of each page's last 200 and the token scanned from that body, so a
+        # 304 on the next poll reuses the scan instead of re-downloading the page
+        self._etag_tokens: Dict[str, Tuple[str, Optional[str]]] = {}
         
         # Set realistic browser headers
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+        
+        # Keep-alive pool so every probe reuses the same TLS connection
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def extract_token_from_browser(self) -> Optional[str]:
         """Main method to extract token from browser"""
@@ -73,19 +117,11 @@ class BrowserTokenExtractor:
         try:
             logger.info("🔍 Checking for active Savanna session...")
             
-            # Try to access a protected page
-            response = self.session.get(
-                f"{self.savanna_base_url}/creative-pulling",
-                timeout=10,
-                allow_redirects=False
-            )
-            
-            if response.status_code == 200:
+            # Try to access a protected page; a short no-redirect probe is enough
+            token = self._get_page_token(self._creative_pulling_url, timeout=5)
+            if token:
                 logger.info("✅ Active session found!")
-                # Extract token from response or cookies
-                token = self._extract_token_from_response(response)
-                if token:
-                    return token
+                return token
             
             # Check cookies for tokens
             token = self._extract_token_from_cookies()
@@ -99,62 +135,84 @@ class BrowserTokenExtractor:
             logger.error(f"❌ Error checking active session: {e}")
             return None
     
+    def _get_page_token(self, url: str, timeout: float) -> Optional[str]:
+        """GET a page without following redirects and return the token in its body
+        
+        Conditional on the last ETag seen for the URL; a 304 returns the token
+        scanned from that earlier body.
+        """
+        cached = self._etag_tokens.get(url)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        # Streamed, so close it to hand the connection back to the pool
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=False) as response:
+            if response.status_code == 304 and cached:
+                return cached[1]
+            if response.status_code != 200:
+                return None
+            
+            token = self._extract_token_from_response(response)
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etag_tokens[url] = (etag, token)
+            return token
+    
     def _extract_token_from_response(self, response) -> Optional[str]:
-        """Extract token from HTTP response"""
+        """Extract token from HTTP response, scanning the body as it streams in"""
         try:
-            # Look for token in response text
-            text = response.text
-            
-            # Pattern 1: JWT token in script tags
-            jwt_pattern = r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*'
-            jwt_matches = re.findall(jwt_pattern, text)
-            
-            for match in jwt_matches:
-                if len(match) > 100:  # Likely a real JWT
-                    logger.info(f"🔍 Found JWT token in response: {match[:20]}...")
-                    return match
+            # Don't decode images and other binary bodies just to run the regex over them
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and not any(t in content_type for t in _TEXT_CONTENT_TYPES):
+                return None
             
-            # Pattern 2: Token in localStorage or similar
-            token_patterns = [
-                r'"accessToken"\s*:\s*"([^"]+)"',
-                r'"token"\s*:\s*"([^"]+)"',
-                r'"bearer"\s*:\s*"([^"]+)"',
-                r'Bearer\s+([A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*)'
-            ]
+            if response.encoding is None:
+                response.encoding = 'utf-8'
             
-            for pattern in token_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if match.startswith('eyJ') and len(match) > 100:
-                        logger.info(f"🔍 Found token with pattern: {match[:20]}...")
-                        return match
+            # Keep a tail of the previous chunk so tokens split across chunks still match
+            window = ''
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE, decode_unicode=True):
+                window = window[-_STREAM_OVERLAP:] + chunk
+                token = self._find_token(window, complete=False)
+                if token:
+                    return token
             
-            return None
+            # Matches touching the end of the last window were deferred; check them now
+            return self._find_token(window)
             
         except Exception as e:
             logger.error(f"❌ Error extracting token from response: {e}")
             return None
+        finally:
+            response.close()
+    
+    def _find_token(self, text: str, complete: bool = True) -> Optional[str]:
+        """Find the first plausible token in text
+        
+        With complete=False, text is a window onto a stream and a match that runs
+        to its end may be truncated, so it is left for the next window.
+        """
+        # Every token we accept starts with 'eyJ'; skip the regex when it is absent
+        if 'eyJ' not in text:
+            return None
+        
+        # JWTs, "token" JSON fields and Bearer headers in one pass
+        for match in _TOKEN_RE.finditer(text):
+            if not complete and match.end() == len(text):
+                continue
+            for value in match.groups():
+                if value and value.startswith('eyJ') and len(value) > 100:  # Likely a real JWT
+                    logger.info(f"🔍 Found token in response ({match.lastgroup}): {value[:20]}...")
+                    return value
+        
+        return None
     
     def _extract_token_from_cookies(self) -> Optional[str]:
         """Extract token from cookies"""
         try:
-            cookies = self.session.cookies
-            
-            # Look for common token cookie names
-            token_cookies = [
-                'feathers-jwt',
-                'access_token',
-                'jwt_token',
-                'auth_token',
-                'savanna_token'
-            ]
-            
-            for cookie_name in token_cookies:
-                if cookie_name in cookies:
-                    cookie_value = cookies[cookie_name]
-                    if cookie_value.startswith('eyJ') and len(cookie_value) > 100:
-                        logger.info(f"🔍 Found token in cookie {cookie_name}: {cookie_value[:20]}...")
-                        return cookie_value
+            for cookie_name, cookie_value in self.session.cookies.get_dict().items():
+                if cookie_name in _TOKEN_COOKIE_NAMES and cookie_value and cookie_value.startswith('eyJ') and len(cookie_value) > 100:
+                    logger.info(f"🔍 Found token in cookie {cookie_name}: {cookie_value[:20]}...")
+                    return cookie_value
             
             return None
             
@@ -213,35 +271,23 @@ class BrowserTokenExtractor:
         try:
             logger.info("⏳ Waiting for user to complete login...")
             
-            # Give user time to complete login
-            time.sleep(2)
-            
-            # Try multiple times to extract token
-            for attempt in range(5):
-                logger.info(f"🔄 Attempt {attempt + 1}/5: Checking for fresh token...")
+            # Poll with exponential backoff; the login can land server-side without touching our cookie jar
+            delay = 0.5
+            for attempt in range(6):
+                time.sleep(delay)
+                delay = min(delay * 2, 4.0)
                 
-                # Try to access protected page
-                response = self.session.get(
-                    f"{self.savanna_base_url}/creative-pulling",
-                    timeout=10,
-                    allow_redirects=False
-                )
+                logger.debug("🔄 Attempt %d/6: Checking for fresh token...", attempt + 1)
                 
-                if response.status_code == 200:
-                    # Extract token from response
-                    token = self._extract_token_from_response(response)
-                    if token:
-                        return token
+                # Try to access protected page
+                token = self._get_page_token(self._creative_pulling_url, timeout=10)
+                if token:
+                    return token
                 
                 # Check cookies
                 token = self._extract_token_from_cookies()
                 if token:
                     return token
-                
-                # Wait before next attempt
-                if attempt < 4:
-                    logger.info("⏳ Waiting 3 seconds before next attempt...")
-                    time.sleep(3)
             
             logger.warning("⚠️ Could not extract token after multiple attempts")
             return None
@@ -261,8 +307,9 @@ class BrowserTokenExtractor:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(
-                f"{self.savanna_base_url}/creative-pulling",
+            # Reuse the pooled session connection rather than a fresh handshake
+            response = self.session.get(
+                self._creative_pulling_url,
                 headers=test_headers,
                 timeout=10
             )
@@ -331,4 +378,5 @@ def main():
     print("\n✨ Test complete!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -6,7 +6,14 @@ Uses real browser engine for full MRAID, VAST video, and display ad support
 
 import sys
 import os
+import io
 import json
+import logging
+import queue
+import atexit
+import functools
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 import tempfile
 import webbrowser
 import time
@@ -14,25 +21,578 @@ from datetime import datetime, timedelta, timezone
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
+from concurrent.futures import ThreadPoolExecutor
 # import webview  # Removed due to threading issues on macOS
 from databricks import sql
+import pyarrow as pa
+import pyarrow.compute as pc
 import xml.etree.ElementTree as ET
 import configparser
+import copy
+
+# orjson parses Jobs API responses faster than the stdlib when installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# lxml parses and pretty-prints in C; fall back to ElementTree without it
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
 import html
 import re
+import string
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
 
 # Import the Savanna bearer client for save functionality
 from savanna_bearer_client import SavannaBearerClient
 
+# Per-selection parsing and VAST resolution log at DEBUG to keep the UI path quiet
+logger = logging.getLogger(__name__)
+
 # Configuration
+DB_POOL_SIZE = 4  # Warm Databricks connections kept between queries
+MARKUP_CACHE_SIZE = 16  # Recently viewed creative markups kept in memory
+VAST_CACHE_SIZE = 256  # Resolved VAST chains remembered by URL
+VAST_HOST_CONCURRENCY = 2  # Simultaneous VAST fetches allowed per ad server
+VAST_TIMEOUT = (2, 8)  # Connect and read timeouts for each VAST hop, in seconds
+MARKUP_DISPLAY_LIMIT = 100_000  # Characters shown in the markup text area
+PULLING_SEARCH_LIMIT = 50  # Pulling-queue records shown per creative ID search
+SEARCH_CACHE_SIZE = 256  # Creative list search terms whose matches are remembered
+NETWORK_CATALOG_TTL = 600  # Seconds a downloaded ad network list is searched locally
+NETWORK_CATALOG_PAGE = 1000  # Ad networks requested per page when downloading the list
+NETWORK_CATALOG_MAX_PAGES = 50  # Pages fetched at most, in case the server never reports the end
+NETWORK_CATALOG_RETRY = 60  # Seconds searches stay remote after the list failed to download
 DATABRICKS_SERVER_HOSTNAME = "3218046436603353.3.gcp.databricks.com"
 DATABRICKS_HTTP_PATH = "/sql/1.0/warehouses/41872fc0c36b8259"
 DATABRICKS_TABLE_NAME = "prod_atlas_datalake.pso_sandbox.sampled_ads_persistent"
 DATABRICKS_WORKSPACE_URL = "https://3218046436603353.3.gcp.databricks.com"
 JOB_ID = 366113680363745  # Creative Pull GCS Job
 CREATIVE_PULLING_TABLE = "prod_inneractive_engines_db.inneractive_db_1_8.creative_pulling"
+SAVANNA_NETWORKS_URL = "https://savanna.fyber.com/ad-networks"
+# Newest 25 networks first; searches add a name filter on top
+SAVANNA_NETWORK_PARAMS = {
+    "$limit": "25",
+    "$skip": "0",
+    "$sort[id]": "-1"
+}
+
+# Job run status lines, by result state and then by lifecycle state
+RESULT_STATUS = {
+    'SUCCESS': "✅ Status: Completed Successfully",
+    'FAILED': "❌ Status: Failed",
+    'CANCELLED': "⚠️ Status: Cancelled",
+    'TIMEDOUT': "⏰ Status: Timed Out"
+}
+LIFECYCLE_STATUS = {
+    'RUNNING': "🔄 Status: Running",
+    'PENDING': "⏳ Status: Pending",
+    'TERMINATED': "✅ Status: Completed"
+}
+
+# VAST markup patterns, compiled once; DOTALL lets CDATA span lines
+_CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+# XML declaration; dropped from text before it is re-encoded as UTF-8 for parsing
+_XML_DECL_RE = re.compile(r'^\ufeff?\s*<\?xml[^>]*\?>')
+# Line boundaries for the fallback formatter: before '<', after '>' and at newlines
+_TAG_BREAK_RE = re.compile(r'(?=<)|(?<=>)|\n')
+_VAST_TAG_URI_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'<VASTAdTagURI><!\[CDATA\[(.*?)\]\]></VASTAdTagURI>',
+    r'<VASTAdTagURI>(.*?)</VASTAdTagURI>'
+)]
+_DIRECT_MEDIA_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'<MediaFile[^>]*><!\[CDATA\[(.*?)\]\]></MediaFile>',
+    r'<MediaFile[^>]*>(.*?)</MediaFile>',
+    r'<URL><!\[CDATA\[(.*?)\]\]></URL>',
+    r'<URL>(.*?)</URL>'
+)]
+_CLICK_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'<ClickThrough><!\[CDATA\[(.*?)\]\]></ClickThrough>',
+    r'<ClickThrough>(.*?)</ClickThrough>',
+    r'<ClickTracking><!\[CDATA\[(.*?)\]\]></ClickTracking>',
+    r'<ClickTracking>(.*?)</ClickTracking>'
+)]
+
+# Display preview page, written around the creative markup so the markup
+# itself is never copied into a combined string
+_DISPLAY_HTML_PREFIX = """
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Display Ad Preview</title>
+    <style>
+        body {{ 
+            margin: 0; 
+            padding: 20px; 
+            font-family: Arial, sans-serif; 
+            background: #f5f5f5;
+        }}
+        .ad-container {{ 
+            border: 2px solid #ddd; 
+            border-radius: 8px;
+            padding: 20px; 
+            background: white;
+            max-width: 100%;
+            overflow: auto;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        .ad-content {{ 
+            max-width: 480px;
+            max-height: 320px;
+            margin: 0 auto;
+            overflow: auto;
+        }}
+        .preview-header {{
+            background: #007bff;
+            color: white;
+            padding: 10px 20px;
+            margin: -20px -20px 20px -20px;
+            border-radius: 6px 6px 0 0;
+            font-weight: bold;
+            font-size: 16px;
+        }}
+        .info-panel {{
+            background: #e9ecef;
+            border: 1px solid #dee2e6;
+            border-radius: 4px;
+            padding: 10px;
+            margin: 10px 0;
+            font-size: 12px;
+            color: #495057;
+        }}
+    </style>
+</head>
+<body>
+    <div class="ad-container">
+        <div class="preview-header">
+            🎨 Display Ad Preview - {size}
+        </div>
+        <div class="info-panel">
+            <strong>Creative Info:</strong> ID: {creative_id}, 
+            Size: {size}, Type: {creative_type}
+        </div>
+        <div class="ad-content">
+            """
+_DISPLAY_HTML_SUFFIX = """
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# VAST preview page: the static CSS/JS head is encoded once at import and
+# only the small body template is filled in per preview
+_VAST_HTML_HEAD = """
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>VAST Video Preview</title>
+    <style>
+        body { 
+            margin: 0; 
+            padding: 20px; 
+            font-family: Arial, sans-serif; 
+            background: #f5f5f5;
+            font-size: 14px;
+        }
+        .vast-container { 
+            border: 2px solid #ddd; 
+            border-radius: 8px;
+            padding: 30px; 
+            background: white;
+            text-align: center;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            max-width: 95vw;
+            width: 100%;
+            margin: 0 auto;
+            box-sizing: border-box;
+        }
+        .vast-player {
+            max-width: 100%;
+            margin: 20px auto;
+            text-align: center;
+        }
+        .video-container {
+            width: 100%;
+            max-width: 100%;
+            margin: 0 auto;
+            overflow: hidden;
+            border-radius: 8px;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+            position: relative;
+        }
+        .video-container video {
+            width: 100%;
+            height: auto;
+            object-fit: contain;
+            display: block;
+        }
+        .video-container.portrait {
+            max-width: 400px;
+            margin: 20px auto;
+        }
+        .video-container.portrait video {
+            max-width: 400px;
+            max-height: 600px;
+            width: auto;
+            height: auto;
+        }
+        .video-container.landscape {
+            max-width: 100%;
+            max-height: 70vh;
+            margin: 20px auto;
+            aspect-ratio: 16/9;
+        }
+        .video-container.landscape video {
+            width: 100%;
+            height: 100%;
+            max-height: 70vh;
+            object-fit: contain;
+        }
+        /* Responsive design for different screen sizes */
+        @media (min-width: 1200px) {
+            .video-container.landscape {
+                max-width: 1000px;
+                aspect-ratio: 16/9;
+            }
+        }
+        @media (min-width: 768px) and (max-width: 1199px) {
+            .video-container.landscape {
+                max-width: 90vw;
+                aspect-ratio: 16/9;
+            }
+        }
+        @media (max-width: 767px) {
+            .video-container.landscape {
+                max-width: 95vw;
+                aspect-ratio: 16/9;
+            }
+            .video-container.portrait {
+                max-width: 300px;
+            }
+        }
+        .url-section {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 15px;
+            margin: 20px 0;
+        }
+        .vast-url {
+            background: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 8px;
+            padding: 15px;
+            font-family: monospace;
+            word-break: break-all;
+            text-align: left;
+            font-size: 11px;
+            position: relative;
+            min-height: 80px;
+        }
+        .vast-url.single {
+            grid-column: 1 / -1;
+        }
+        @media (max-width: 768px) {
+            .url-section {
+                grid-template-columns: 1fr;
+            }
+        }
+        .copy-button {
+            position: absolute;
+            top: 5px;
+            right: 5px;
+            background: #007bff;
+            color: white;
+            border: none;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-size: 10px;
+            cursor: pointer;
+        }
+        .copy-button:hover {
+            background: #0056b3;
+        }
+        .preview-header {
+            background: #28a745;
+            color: white;
+            padding: 15px 25px;
+            margin: -30px -30px 25px -30px;
+            border-radius: 6px 6px 0 0;
+            font-weight: bold;
+            font-size: 18px;
+        }
+        .info-panel {
+            background: #e9ecef;
+            border: 1px solid #dee2e6;
+            border-radius: 6px;
+            padding: 15px;
+            margin: 15px 0;
+            font-size: 14px;
+            color: #495057;
+        }
+        .companion-section {
+            margin-top: 20px;
+            border-top: 2px solid #dee2e6;
+            padding-top: 20px;
+        }
+        .companion-ad {
+            border: 1px solid #ccc;
+            margin: 10px auto;
+            max-width: 300px;
+            background: white;
+        }
+        .button-row {
+            display: flex;
+            gap: 10px;
+            justify-content: center;
+            margin: 15px 0;
+            flex-wrap: wrap;
+        }
+        .action-button {
+            background: #6c757d;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            font-size: 12px;
+            cursor: pointer;
+            text-decoration: none;
+            display: inline-block;
+        }
+        .action-button:hover {
+            background: #545b62;
+        }
+        .action-button.primary {
+            background: #007bff;
+        }
+        .action-button.primary:hover {
+            background: #0056b3;
+        }
+    </style>
+    <script>
+        function copyToClipboard(text) {
+            navigator.clipboard.writeText(text).then(function() {
+                // Show a brief "Copied!" message
+                const button = event.target;
+                const originalText = button.textContent;
+                button.textContent = 'Copied!';
+                button.style.background = '#28a745';
+                setTimeout(function() {
+                    button.textContent = originalText;
+                    button.style.background = '#007bff';
+                }, 1000);
+            });
+        }
+    </script>
+</head>
+""".encode('utf-8')
+_VAST_HTML_BODY_TMPL = string.Template("""<body>
+    <div class="vast-container">
+        <div class="preview-header">
+            🎬 VAST Video Ad Player - $size
+        </div>
+        <div class="info-panel">
+            <strong>Creative Info:</strong> ID: $creative_id, 
+            Size: $size, Type: $creative_type
+        </div>
+        
+
+        
+        <div class="vast-player">
+            <div class="video-container $orientation">
+                <video controls>
+                    <source src="$vast_url" type="video/mp4">
+                    <source src="$vast_url" type="video/webm">
+                    <source src="$vast_url" type="video/ogg">
+                    Your browser does not support the video tag.
+                </video>
+            </div>
+        </div>
+        
+        <div class="url-section">
+            <div class="vast-url$url_class">
+                <button class="copy-button" onclick="copyToClipboard($vast_url_js)">Copy</button>
+                <strong>🎯 Video URL:</strong><br>
+                $vast_url
+            </div>
+            
+        </div>
+        
+        $companion_html
+    </div>
+</body>
+</html>
+""")
+
+# Built once and shared; lxml evaluates these in C rather than walking subtrees
+# in Python, and the parsers never expand entities or fetch over the network
+if lxml_etree is not None:
+    _XML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+    _PRETTY_XML_PARSER = lxml_etree.XMLParser(remove_blank_text=True, resolve_entities=False, no_network=True)
+    _STATIC_RESOURCE_XPATH = lxml_etree.XPath('(.//StaticResource)[1]/text()')
+    _COMPANION_CLICK_XPATH = lxml_etree.XPath('(.//CompanionClickThrough)[1]/text()')
+
+def _set_readonly_text(widget, text):
+    """Replace the contents of a disabled Text widget"""
+    widget.config(state=tk.NORMAL)
+    # One Tcl replace instead of a delete, a relayout of the empty widget and an insert
+    widget.replace(1.0, tk.END, text)
+    widget.config(state=tk.DISABLED)
+
+def _js_attr(value):
+    """Quote value as a JS string literal that is safe inside a double-quoted HTML attribute"""
+    return html.escape(json.dumps(value))
+
+def _xml_bytes(xml):
+    """XML as bytes for the parsers, which would otherwise trust a stale encoding declaration"""
+    if isinstance(xml, bytes):
+        return xml
+    # The text is already decoded, so a declared encoding no longer describes these bytes
+    return _XML_DECL_RE.sub('', xml, count=1).encode('utf-8')
+
+def _first_text(texts):
+    """Stripped text from an XPath text() result, or None if there is none"""
+    text = ''.join(texts).strip()
+    return text or None
+
+class Creatives:
+    """Creatives loaded from Databricks, stored column-wise as Arrow arrays"""
+    __slots__ = ('day', 'mmdd', 'cid', 'size', 'w', 'h', 'type', 'search_index', 'display', '_matches')
+    
+    @classmethod
+    def from_arrow(cls, table):
+        """Build from the Arrow table returned by the creatives query"""
+        creatives = cls()
+        creatives._matches = {}
+        creatives.day = table.column('day').combine_chunks()
+        creatives.mmdd = cls._format_days(creatives.day)
+        creatives.cid = pc.cast(table.column('creativeId'), pa.string()).combine_chunks()
+        creatives.size = pc.cast(table.column('adSize'), pa.string()).combine_chunks()
+        creatives.type = pc.cast(table.column('type'), pa.string()).combine_chunks()
+        
+        # Parse ad_size into width/height columns in one pass;
+        # missing or non-WxH sizes become null
+        valid = pc.fill_null(pc.match_substring_regex(creatives.size, r'^\d{1,4}x\d{1,4}$'), False)
+        size_parts = pc.split_pattern(pc.if_else(valid, creatives.size, pa.scalar(None, pa.string())), 'x')
+        creatives.w = pc.cast(pc.list_element(size_parts, 0), pa.int16())
+        creatives.h = pc.cast(pc.list_element(size_parts, 1), pa.int16())
+        
+        # One lowercased haystack per row for plain substring search
+        creatives.search_index = pc.utf8_lower(pc.binary_join_element_wise(
+            creatives.cid, creatives.size, creatives.type, creatives.mmdd, '\t',
+            null_handling='replace', null_replacement='None'
+        )).to_pylist()
+        
+        # Listbox text per row, so filtering never reformats
+        creatives.display = pc.binary_join_element_wise(
+            creatives.mmdd, creatives.cid, creatives.size, creatives.type, ' | ',
+            null_handling='replace', null_replacement='None'
+        ).to_pylist()
+        return creatives
+    
+    @staticmethod
+    def _format_days(day):
+        """Format the day column as MM/DD for display and search"""
+        if pa.types.is_temporal(day.type):
+            days = pc.strftime(day, format='%m/%d')
+        else:
+            # ISO date strings are sliced to MM/DD without parsing; anything
+            # else keeps its first 10 characters
+            days = pc.replace_substring_regex(
+                pc.cast(day, pa.string()), r'^\d{4}-(\d{2})-(\d{2}).*$', r'\1/\2'
+            )
+            days = pc.utf8_slice_codeunits(days, 0, 10)
+        return pc.fill_null(days, 'N/A')
+    
+    def __len__(self):
+        return len(self.cid)
+    
+    def row(self, index):
+        """Materialize a single creative as a dict"""
+        w, h = self.w[index].as_py(), self.h[index].as_py()
+        return {
+            'row': index,
+            'day': self.day[index].as_py(),
+            'id': self.cid[index].as_py(),
+            'size': self.size[index].as_py(),
+            'width': w,
+            'height': h,
+            # Portrait if height > width OR if it's a mobile-style video (like 480x320);
+            # missing or malformed sizes count as landscape
+            'portrait': w is not None and h is not None and (h > w or (w <= 480 and h <= 640)),
+            'type': self.type[index].as_py()
+        }
+    
+    def match(self, needle, rows=None):
+        """Row indices (among rows, if given) whose ID, size, type or date contain the lowercase needle"""
+        if not needle:
+            return range(len(self))
+        
+        # Backspacing or retyping a term reuses its earlier result
+        matches = self._matches.get(needle)
+        if matches is not None:
+            return matches
+        
+        search_index = self.search_index
+        if rows is None:
+            matches = [row for row, haystack in enumerate(search_index) if needle in haystack]
+        else:
+            matches = [row for row in rows if needle in search_index[row]]
+        
+        if len(self._matches) >= SEARCH_CACHE_SIZE:
+            self._matches.clear()
+        self._matches[needle] = matches
+        return matches
+    
+    def format_rows(self, rows):
+        """Listbox text for the given rows"""
+        display = self.display
+        return [display[row] for row in rows]
+
+
+class NetworkCatalog:
+    """All Savanna ad networks, newest first, with a character-bigram index for name searches"""
+    __slots__ = ('networks', 'names', 'loaded_at', '_bigrams')
+    
+    def __init__(self, networks):
+        self.networks = [(n.get('name', ''), n.get('id', '')) for n in networks if n.get('name') and n.get('id')]
+        self.names = [name.lower() for name, _ in self.networks]
+        self.loaded_at = time.monotonic()
+        self._bigrams = defaultdict(set)
+        for index, name in enumerate(self.names):
+            for i in range(len(name) - 1):
+                self._bigrams[name[i:i + 2]].add(index)
+    
+    def is_fresh(self):
+        """Whether the catalog is younger than NETWORK_CATALOG_TTL"""
+        return time.monotonic() - self.loaded_at < NETWORK_CATALOG_TTL
+    
+    def search(self, term, limit=25):
+        """(name, id) of the newest networks whose name contains term, case-insensitively"""
+        term = term.lower()
+        grams = {term[i:i + 2] for i in range(len(term) - 1)}
+        if grams:
+            candidates = set.intersection(*(self._bigrams.get(gram, set()) for gram in grams))
+        else:
+            candidates = range(len(self.names))
+        
+        names = self.names
+        matches = []
+        for index in sorted(candidates):
+            if term in names[index]:
+                matches.append(self.networks[index])
+                if len(matches) == limit:
+                    break
+        return matches
+
 
 class CreativePreviewerApp:
     def __init__(self, root):
@@ -41,15 +601,68 @@ class CreativePreviewerApp:
         self.root.geometry("1400x900")
         
         # Initialize variables
-        self.creatives = []
+        self.creatives = None
+        self._visible_rows = []
+        self._filter_job = None
+        self._last_search = ""
         self.current_creative = None
         self.current_markup = None
+        self._config_cache = {}
         self.access_token = self.load_configuration()
         
+        # Databricks connection pool (filled lazily by _get_conn)
+        self._db_pool = queue.Queue(maxsize=DB_POOL_SIZE)
+        atexit.register(self._close_db_pool)
+        self._fetch_markup = functools.lru_cache(maxsize=MARKUP_CACHE_SIZE)(self._query_markup)
+        
+        # Shared HTTP session for the Databricks Jobs API
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        self.http.headers.update({
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json"
+        })
+        
+        # Separate keep-alive session for VAST wrapper hops (no Databricks auth)
+        self._vast_http = requests.Session()
+        vast_retry = Retry(total=1, connect=1, backoff_factor=0.2)
+        vast_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=vast_retry)
+        self._vast_http.mount('https://', vast_adapter)
+        self._vast_http.mount('http://', vast_adapter)
+        self._vast_http.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'application/xml,text/xml,*/*;q=0.8'
+        })
+        
+        self._vast_executor = ThreadPoolExecutor(max_workers=4)
+        self._vast_cache = OrderedDict()
+        self._vast_cache_lock = threading.Lock()
+        # A slow ad server should not tie up every VAST worker
+        self._vast_host_slots = defaultdict(lambda: threading.Semaphore(VAST_HOST_CONCURRENCY))
+        # Re-previewing or re-beautifying a creative reuses earlier results instead of reparsing
+        self._companion_ad_info = functools.lru_cache(maxsize=MARKUP_CACHE_SIZE)(self._extract_companion_ad_info)
+        self._formatted_markup = functools.lru_cache(maxsize=MARKUP_CACHE_SIZE)(self._format_markup)
+        
+        # Previews reuse fixed per-process files in the temp directory, removed on exit
+        self._preview_path = os.path.join(tempfile.gettempdir(), f'creative_preview_{os.getpid()}.html')
+        self._vast_preview_path = os.path.join(tempfile.gettempdir(), f'creative_vast_preview_{os.getpid()}.html')
+        atexit.register(self._remove_preview_files)
+        
+        # Start the first query now so it runs while the UI is being built
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._load_future = executor.submit(self._fetch_creatives_blocking)
+        executor.shutdown(wait=False)
+        
         # Initialize Savanna client
         try:
             from savanna_bearer_client import SavannaBearerClient
             self.savanna_client = SavannaBearerClient()
+            # Keep Savanna connections warm across network searches; only idempotent
+            # requests are retried, so creative submissions are never sent twice
+            savanna_retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+            self.savanna_client.session.mount(
+                'https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=savanna_retry)
+            )
         except Exception as e:
             print(f"⚠️ Warning: Could not initialize Savanna client: {e}")
             self.savanna_client = None
@@ -57,12 +670,15 @@ class CreativePreviewerApp:
         # Job monitoring variables
         self.current_run_id = None
         self.monitoring_active = False
+        self._poll_interval_ms = 1000
+        self._last_run_state = None
         
         # Setup UI
         self.setup_ui()
         
-        # Load creatives (this will validate the token)
-        self.load_creatives()
+        # Show creatives once the startup query finishes (this will validate the token)
+        self.status_label.config(text="Loading creatives from Databricks...")
+        self.root.after(50, self._drain_load_future)
     
     def setup_ui(self):
         # Main container
@@ -113,7 +729,8 @@ class CreativePreviewerApp:
         listbox_frame = ttk.Frame(list_frame)
         listbox_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.creative_listbox = tk.Listbox(listbox_frame, font=("Courier", 12))
+        self._items_var = tk.Variable(value=())
+        self.creative_listbox = tk.Listbox(listbox_frame, listvariable=self._items_var, font=("Courier", 12))
         scrollbar = ttk.Scrollbar(listbox_frame, orient=tk.VERTICAL, command=self.creative_listbox.yview)
         self.creative_listbox.configure(yscrollcommand=scrollbar.set)
         
@@ -173,7 +790,7 @@ class CreativePreviewerApp:
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_input_frame, textvariable=self.search_var, width=30)
         self.search_entry.pack(side=tk.LEFT, padx=(5, 10))
-        self.search_entry.bind('<KeyRelease>', self.filter_creatives)
+        self.search_var.trace_add('write', self._schedule_filter)
         
         # Refresh DB button
         refresh_button = ttk.Button(search_input_frame, text="🔄 Refresh DB", command=self.refresh_database)
@@ -330,6 +947,12 @@ class CreativePreviewerApp:
         
         # Initialize mode and add flag for initial network loading
         self.networks_loaded = False
+        # Bumped per keystroke so results of superseded network searches are dropped
+        self._search_seq = 0
+        self._search_timer = None
+        self._network_catalog = None
+        self._network_catalog_failed_at = None
+        self._network_catalog_lock = threading.Lock()
         self.on_mode_change()
     
     def on_mode_change(self):
@@ -352,6 +975,8 @@ class CreativePreviewerApp:
             self.info_label.config(text="💾 Save Mode: Add a new creative to the pulling queue (auto-fills: Creation Date, Expire Date, Active)")
             # Load initial networks for the dropdown
             self._load_initial_networks()
+            # Warm the searchable network list so the first typed search doesn't wait on it
+            self._prefetch_network_catalog()
     
     def unified_savanna_action(self):
         """Unified action handler for both search and save modes"""
@@ -372,11 +997,7 @@ class CreativePreviewerApp:
         
         # Disable button and show status
         self.unified_action_button.config(state='disabled')
-        self.unified_results.config(state=tk.NORMAL)
-        self.unified_results.delete(1.0, tk.END)
-        self.unified_results.insert(tk.END, f"🔍 Searching for Creative ID: {creative_id}...")
-        self.unified_results.config(state=tk.DISABLED)
-        self.root.update()
+        self._set_status(f"🔍 Searching for Creative ID: {creative_id}...")
         
         # Search in background thread
         threading.Thread(target=self._unified_search_thread, args=(creative_id,), daemon=True).start()
@@ -403,11 +1024,7 @@ class CreativePreviewerApp:
         
         # Disable button and show status
         self.unified_action_button.config(state='disabled')
-        self.unified_results.config(state=tk.NORMAL)
-        self.unified_results.delete(1.0, tk.END)
-        self.unified_results.insert(tk.END, f"🚀 Submitting Creative ID: {creative_id} to Savanna...")
-        self.unified_results.config(state=tk.DISABLED)
-        self.root.update()
+        self._set_status(f"🚀 Submitting Creative ID: {creative_id} to Savanna...")
         
         # Save in background thread
         threading.Thread(target=self._unified_save_thread, args=(creative_id, ad_network_id), daemon=True).start()
@@ -417,20 +1034,23 @@ class CreativePreviewerApp:
         self.unified_creative_id_var.set("")
         self.unified_ad_network_id_var.set("")
         self.network_dropdown_var.set("")
-        self.unified_results.config(state=tk.NORMAL)
-        self.unified_results.delete(1.0, tk.END)
-        self.unified_results.insert(tk.END, "🎯 Select a mode and enter Creative ID to get started...")
-        self.unified_results.config(state=tk.DISABLED)
+        self._set_status("🎯 Select a mode and enter Creative ID to get started...")
         
         # Reload initial networks if in save mode
         if self.savanna_mode_var.get() == "save":
             self._load_initial_networks()
     
+    def _set_status(self, text):
+        """Replace the read-only Savanna results text"""
+        _set_readonly_text(self.unified_results, text)
+    
     def on_network_search_change(self, event=None):
         """Handle network search input changes with delay to prevent rapid searching"""
-        # Cancel any existing timer
-        if hasattr(self, '_search_timer'):
+        # Cancel any existing timer and ignore searches still in flight
+        if self._search_timer:
             self.root.after_cancel(self._search_timer)
+            self._search_timer = None
+        self._search_seq += 1
         
         search_term = self.network_dropdown_var.get().strip()
         
@@ -444,20 +1064,28 @@ class CreativePreviewerApp:
         self.network_status_label.config(text=f"🔍 Searching for networks containing '{search_term}'...")
         
         # Set a timer to search after user stops typing (1000ms delay - increased for better UX)
-        self._search_timer = self.root.after(1000, lambda: self._search_networks_thread(search_term))
+        self._search_timer = self.root.after(1000, self._start_network_search, search_term, self._search_seq)
+    
+    def _start_network_search(self, search_term, seq):
+        """Run a debounced network search off the UI thread"""
+        self._search_timer = None
+        threading.Thread(target=self._search_networks_thread, args=(search_term, False, seq), daemon=True).start()
     
     def _load_initial_networks(self):
         """Load initial list of networks when dropdown is first shown"""
         # Only load if we haven't already loaded networks
         if not self.networks_loaded:
             self.network_status_label.config(text="Loading initial networks...")
-            threading.Thread(target=self._search_networks_thread, args=("", True), daemon=True).start()
+            threading.Thread(target=self._search_networks_thread, args=("", True, self._search_seq), daemon=True).start()
         else:
             # Networks already loaded, just update status
             self.network_status_label.config(text=f"Loaded {len(self.network_dropdown['values'])} networks")
     
-    def _search_networks_thread(self, search_term, is_initial_load=False):
+    def _search_networks_thread(self, search_term, is_initial_load=False, seq=None):
         """Search for networks in background thread"""
+        def completed(network_options, status_message, network_id_map=None):
+            self.root.after(0, self._network_search_completed, network_options, status_message, seq, network_id_map)
+        
         try:
             # Use the existing Savanna client instance
             if not self.savanna_client:
@@ -466,28 +1094,29 @@ class CreativePreviewerApp:
             
             savanna_client = self.savanna_client
             
-            # Make API call to search networks - using the exact format from HAR file
-            url = "https://savanna.fyber.com/ad-networks"
+            # Typed searches run against the downloaded network list when possible
+            if not is_initial_load:
+                catalog = self._get_network_catalog()
+                if catalog is not None:
+                    networks = catalog.search(search_term)
+                    print(f"📚 Found {len(networks)} cached networks matching '{search_term}'")
+                    if networks:
+                        completed([name for name, _ in networks], f"Found {len(networks)} networks", dict(networks))
+                    else:
+                        completed([], "No networks found")
+                    return
             
+            # Make API call to search networks - using the exact format from HAR file
             if is_initial_load:
                 # For initial load, get first 25 networks without search filter
-                params = {
-                    "$limit": "25",
-                    "$skip": "0", 
-                    "$sort[id]": "-1"
-                }
+                params = SAVANNA_NETWORK_PARAMS
                 print(f"🔍 Loading initial networks with params: {params}")
             else:
                 # For search, add the name filter
-                params = {
-                    "$limit": "25",
-                    "$skip": "0", 
-                    "$sort[id]": "-1",
-                    "name[$like]": f"%{search_term}%"
-                }
+                params = {**SAVANNA_NETWORK_PARAMS, "name[$like]": f"%{search_term}%"}
                 print(f"🔍 Searching networks with params: {params}")
             
-            response = savanna_client.session.get(url, params=params, timeout=15)
+            response = savanna_client.session.get(SAVANNA_NETWORKS_URL, params=params, timeout=15)
             
             print(f"📡 API Response Status: {response.status_code}")
             
@@ -500,39 +1129,91 @@ class CreativePreviewerApp:
                     if networks:
                         # Extract network names and IDs
                         network_options = []
-                        self.network_id_map = {}  # Store mapping of names to IDs
+                        network_id_map = {}  # Mapping of names to IDs, stored once the search completes
                         
                         for network in networks:
                             name = network.get('name', '')
                             network_id = network.get('id', '')
                             if name and network_id:
                                 network_options.append(name)
-                                self.network_id_map[name] = network_id
+                                network_id_map[name] = network_id
                                 print(f"📡 Network: {name} (ID: {network_id})")
                         
                         # Update UI in main thread
                         if is_initial_load:
-                            self.root.after(0, lambda: self._network_search_completed(network_options, f"Loaded {len(networks)} networks"))
+                            completed(network_options, f"Loaded {len(networks)} networks", network_id_map)
                         else:
-                            self.root.after(0, lambda: self._network_search_completed(network_options, f"Found {len(networks)} networks"))
+                            completed(network_options, f"Found {len(networks)} networks", network_id_map)
                     else:
-                        self.root.after(0, lambda: self._network_search_completed([], "No networks found"))
+                        completed([], "No networks found")
                         
                 except Exception as json_error:
                     print(f"❌ JSON parsing error: {json_error}")
-                    self.root.after(0, lambda: self._network_search_completed([], f"JSON parsing error: {json_error}"))
+                    completed([], f"JSON parsing error: {json_error}")
             else:
                 error_msg = f"Search failed: {response.status_code}"
                 print(f"❌ {error_msg}")
-                self.root.after(0, lambda: self._network_search_completed([], error_msg))
+                completed([], error_msg)
                 
         except Exception as e:
             error_msg = f"Search error: {str(e)}"
             print(f"❌ {error_msg}")
-            self.root.after(0, lambda: self._network_search_completed([], error_msg))
+            completed([], error_msg)
     
-    def _network_search_completed(self, network_options, status_message):
-        """Handle completed network search"""
+    def _prefetch_network_catalog(self):
+        """Download the network list in the background if it isn't cached"""
+        if not self.savanna_client:
+            return
+        if self._network_catalog is None or not self._network_catalog.is_fresh():
+            threading.Thread(target=self._get_network_catalog, daemon=True).start()
+    
+    def _get_network_catalog(self):
+        """Network list for local searches, downloaded again once stale; None if it can't be loaded"""
+        with self._network_catalog_lock:
+            if self._network_catalog is None or not self._network_catalog.is_fresh():
+                # Don't repeat a full paged download on every keystroke while the endpoint is failing
+                failed_at = self._network_catalog_failed_at
+                if failed_at is not None and time.monotonic() - failed_at < NETWORK_CATALOG_RETRY:
+                    return None
+                try:
+                    self._network_catalog = NetworkCatalog(self._fetch_all_networks())
+                except Exception as e:
+                    self._network_catalog_failed_at = time.monotonic()
+                    print(f"⚠️ Could not load network list, searching remotely: {e}")
+                    return None
+                self._network_catalog_failed_at = None
+            return self._network_catalog
+    
+    def _fetch_all_networks(self):
+        """Download every ad network from Savanna, newest first, a page at a time"""
+        networks = []
+        for _ in range(NETWORK_CATALOG_MAX_PAGES):
+            params = {**SAVANNA_NETWORK_PARAMS, "$limit": str(NETWORK_CATALOG_PAGE), "$skip": str(len(networks))}
+            response = self.savanna_client.session.get(SAVANNA_NETWORKS_URL, params=params, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            batch = data.get('data', [])
+            networks.extend(batch)
+            
+            # A short page is the last one. The server may cap the page size below
+            # what we asked for, so compare against the limit it reports applying.
+            total = data.get('total')
+            page_size = data.get('limit') or NETWORK_CATALOG_PAGE
+            if len(batch) < page_size or (total is not None and len(networks) >= total):
+                break
+        else:
+            print(f"⚠️ Stopped downloading networks after {NETWORK_CATALOG_MAX_PAGES} pages")
+        
+        print(f"📚 Downloaded {len(networks)} networks")
+        return networks
+    
+    def _network_search_completed(self, network_options, status_message, seq=None, network_id_map=None):
+        """Handle completed network search unless a newer search has started"""
+        if seq is not None and seq != self._search_seq:
+            return
+        
+        if network_id_map is not None:
+            self.network_id_map = network_id_map
         self.network_dropdown['values'] = network_options
         self.network_status_label.config(text=status_message)
         
@@ -561,70 +1242,66 @@ class CreativePreviewerApp:
     def _unified_search_thread(self, creative_id):
         """Search for creative ID in background thread"""
         try:
-            # Databricks connection
-            connection_params = {
-                "server_hostname": DATABRICKS_SERVER_HOSTNAME,
-                "http_path": DATABRICKS_HTTP_PATH,
-                "access_token": self.access_token
-            }
+            # Query creative_pulling table for the specific creative_id
+            query = f"""
+            SELECT 
+                creative_id,
+                creation_date,
+                expire_date,
+                active
+            FROM {CREATIVE_PULLING_TABLE} 
+            WHERE creative_id = :creative_id
+            ORDER BY creation_date DESC
+            LIMIT {PULLING_SEARCH_LIMIT}
+            """
+            
+            results = self._execute(query, {"creative_id": creative_id})
             
-            with sql.connect(**connection_params) as connection:
-                with connection.cursor() as cursor:
-                    # Query creative_pulling table for the specific creative_id
-                    query = f"""
-                    SELECT 
-                        creative_id,
-                        creation_date,
-                        expire_date,
-                        active
-                    FROM {CREATIVE_PULLING_TABLE} 
-                    WHERE creative_id = '{creative_id}'
-                    ORDER BY creation_date DESC
-                    """
+            if results:
+                # Format results - only essential information
+                lines = [f"✅ FOUND: Creative ID '{creative_id}' is in the pulling queue\n"]
+                current_time = datetime.now()
+                
+                for i, row in enumerate(results, 1):
+                    creative_id, creation_date, expire_date, active = row
+                    
+                    # Format dates
+                    creation_str = creation_date.strftime('%Y-%m-%d %H:%M:%S') if creation_date else 'N/A'
+                    expire_str = expire_date.strftime('%Y-%m-%d %H:%M:%S') if expire_date else 'N/A'
                     
-                    cursor.execute(query)
-                    results = cursor.fetchall()
+                    lines.append(f"📋 Record {i}:")
+                    lines.append(f"   🕒 Created Time: {creation_str}")
+                    lines.append(f"   ⏰ Expire Time: {expire_str}")
                     
-                    if results:
-                        # Format results - only essential information
-                        result_text = f"✅ FOUND: Creative ID '{creative_id}' is in the pulling queue\n\n"
+                    # Check if expired and show status
+                    if expire_date:
+                        # Convert to naive datetime for comparison if needed
+                        if expire_date.tzinfo is not None:
+                            expire_date = expire_date.replace(tzinfo=None)
                         
-                        for i, row in enumerate(results, 1):
-                            creative_id, creation_date, expire_date, active = row
-                            
-                            # Format dates
-                            creation_str = creation_date.strftime('%Y-%m-%d %H:%M:%S') if creation_date else 'N/A'
-                            expire_str = expire_date.strftime('%Y-%m-%d %H:%M:%S') if expire_date else 'N/A'
-                            
-                            result_text += f"📋 Record {i}:\n"
-                            result_text += f"   🕒 Created Time: {creation_str}\n"
-                            result_text += f"   ⏰ Expire Time: {expire_str}\n"
-                            
-                            # Check if expired and show status
-                            if expire_date:
-                                # Convert to naive datetime for comparison if needed
-                                if expire_date.tzinfo is not None:
-                                    expire_date = expire_date.replace(tzinfo=None)
-                                current_time = datetime.now().replace(tzinfo=None)
-                                
-                                if expire_date < current_time:
-                                    result_text += f"   ⚠️  Status: EXPIRED\n"
-                                elif active:
-                                    result_text += f"   ✅ Status: ACTIVE\n"
-                                else:
-                                    result_text += f"   ❌ Status: INACTIVE\n"
-                            elif active:
-                                result_text += f"   ✅ Status: ACTIVE\n"
-                            else:
-                                result_text += f"   ❌ Status: INACTIVE\n"
-                            
-                            result_text += "\n"
+                        if expire_date < current_time:
+                            lines.append("   ⚠️  Status: EXPIRED")
+                        elif active:
+                            lines.append("   ✅ Status: ACTIVE")
+                        else:
+                            lines.append("   ❌ Status: INACTIVE")
+                    elif active:
+                        lines.append("   ✅ Status: ACTIVE")
                     else:
-                        result_text = f"❌ NOT FOUND: Creative ID '{creative_id}' is not in the pulling queue\n\n"
-                        result_text += "This creative ID has not been added to the pulling queue yet."
+                        lines.append("   ❌ Status: INACTIVE")
                     
-                    # Update UI in main thread
-                    self.root.after(0, lambda: self._unified_search_completed(result_text))
+                    lines.append("")
+                
+                if len(results) == PULLING_SEARCH_LIMIT:
+                    lines.append(f"ℹ️ Showing the {PULLING_SEARCH_LIMIT} most recent records")
+                    lines.append("")
+                result_text = "\n".join(lines) + "\n"
+            else:
+                result_text = f"❌ NOT FOUND: Creative ID '{creative_id}' is not in the pulling queue\n\n"
+                result_text += "This creative ID has not been added to the pulling queue yet."
+            
+            # Update UI in main thread
+            self.root.after(0, lambda: self._unified_search_completed(result_text))
                     
         except Exception as e:
             error_msg = f"❌ Error searching for Creative ID: {str(e)}"
@@ -633,10 +1310,7 @@ class CreativePreviewerApp:
     def _unified_search_completed(self, result_text):
         """Handle completed unified search"""
         self.unified_action_button.config(state='normal')
-        self.unified_results.config(state=tk.NORMAL)
-        self.unified_results.delete(1.0, tk.END)
-        self.unified_results.insert(tk.END, result_text)
-        self.unified_results.config(state=tk.DISABLED)
+        self._set_status(result_text)
     
     def _unified_save_thread(self, creative_id, ad_network_id):
         """Save creative in background thread"""
@@ -687,10 +1361,7 @@ class CreativePreviewerApp:
     def _unified_save_completed(self, result_text, success):
         """Handle completed unified save operation"""
         self.unified_action_button.config(state='normal')
-        self.unified_results.config(state=tk.NORMAL)
-        self.unified_results.delete(1.0, tk.END)
-        self.unified_results.insert(tk.END, result_text)
-        self.unified_results.config(state=tk.DISABLED)
+        self._set_status(result_text)
         
         # Show popup for success/failure
         if success:
@@ -720,11 +1391,7 @@ class CreativePreviewerApp:
         
         # Disable button and show status
         self.save_creative_button.config(state='disabled')
-        self.save_creative_results.config(state=tk.NORMAL)
-        self.save_creative_results.delete(1.0, tk.END)
-        self.save_creative_results.insert(tk.END, f"🚀 Submitting Creative ID: {creative_id} to Savanna...")
-        self.save_creative_results.config(state=tk.DISABLED)
-        self.root.update()
+        _set_readonly_text(self.save_creative_results, f"🚀 Submitting Creative ID: {creative_id} to Savanna...")
         
         # Save in background thread
         threading.Thread(target=self._save_creative_thread, args=(creative_id, ad_network_id), daemon=True).start()
@@ -734,11 +1401,7 @@ class CreativePreviewerApp:
         try:
             # Use the existing Savanna client instance
             if not self.savanna_client:
-                self.save_creative_results.config(state=tk.NORMAL)
-                self.save_creative_results.delete(1.0, tk.END)
-                self.save_creative_results.insert(tk.END, "❌ Savanna client not available")
-                self.save_creative_results.config(state=tk.DISABLED)
-                self.save_creative_button.config(state='normal')
+                self.root.after(0, self._save_completed, "❌ Savanna client not available", False)
                 return
             
             savanna_client = self.savanna_client
@@ -782,10 +1445,7 @@ class CreativePreviewerApp:
     def _save_completed(self, result_text, success):
         """Handle completed save operation"""
         self.save_creative_button.config(state='normal')
-        self.save_creative_results.config(state=tk.NORMAL)
-        self.save_creative_results.delete(1.0, tk.END)
-        self.save_creative_results.insert(tk.END, result_text)
-        self.save_creative_results.config(state=tk.DISABLED)
+        _set_readonly_text(self.save_creative_results, result_text)
         
         # Show popup for success/failure
         if success:
@@ -841,7 +1501,6 @@ class CreativePreviewerApp:
             # Disable button and show status
             self.run_job_button.config(state='disabled')
             self.job_status_label.config(text="🔄 Running job...")
-            self.root.update()
             
             # Run job in background thread
             threading.Thread(target=self._run_job_thread, args=(start_date, end_date), daemon=True).start()
@@ -869,20 +1528,14 @@ class CreativePreviewerApp:
             # API endpoint
             api_url = f"{DATABRICKS_WORKSPACE_URL}/api/2.1/jobs/run-now"
             
-            # Headers
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json"
-            }
-            
             # Update UI
             self.root.after(0, lambda: self._update_job_status("📡 Sending job request to Databricks..."))
             
             # Make the API request
-            response = requests.post(api_url, headers=headers, json=job_params, timeout=30)
+            response = self.http.post(api_url, json=job_params, timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
+                result = json_loads(response.content)
                 run_id = result.get('run_id')
                 
                 # Update UI with success
@@ -902,98 +1555,134 @@ class CreativePreviewerApp:
         """Start monitoring the job progress"""
         self.current_run_id = run_id
         self.monitoring_active = True
+        self._poll_interval_ms = 1000
+        self._last_run_state = None
         self.root.after(0, lambda: self._monitor_job_progress(run_id))
     
     def _monitor_job_progress(self, run_id):
         """Monitor job progress and update UI"""
-        if not self.monitoring_active:
+        # A newer run's monitor supersedes any chain still scheduled for an older one
+        if not self.monitoring_active or run_id != self.current_run_id:
             return
-            
+        
+        # The status request can take up to its 30s timeout; keep it off the Tk thread
+        thread = threading.Thread(target=self._poll_job_status, args=(run_id,), daemon=True)
+        thread.start()
+    
+    def _poll_job_status(self, run_id):
+        """Fetch a job run's status in the background and hand it to the UI thread"""
         try:
             # Get job run status
             api_url = f"{DATABRICKS_WORKSPACE_URL}/api/2.1/jobs/runs/get"
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json"
-            }
             params = {"run_id": run_id}
             
-            response = requests.get(api_url, headers=headers, params=params, timeout=30)
+            response = self.http.get(api_url, params=params, timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
-                state = result.get('state', {})
-                life_cycle_state = state.get('life_cycle_state', 'UNKNOWN')
-                result_state = state.get('result_state', 'UNKNOWN')
-                state_message = state.get('state_message', '')
-                
-                # Format timestamps
-                start_time = result.get('start_time', 0)
-                end_time = result.get('end_time', 0)
-                
-                start_str = "N/A"
-                if start_time:
-                    start_dt = datetime.fromtimestamp(start_time / 1000)
-                    start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                end_str = "N/A"
-                if end_time:
-                    end_dt = datetime.fromtimestamp(end_time / 1000)
-                    end_str = end_dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Create status message
-                status_parts = [
-                    f"🆔 Run ID: {run_id}",
-                    f"🏃‍♂️ Status: {life_cycle_state}",
-                    f"📊 Result: {result_state}",
-                    f"🕐 Started: {start_str}"
-                ]
-                
-                if end_time:
-                    status_parts.append(f"🕐 Ended: {end_str}")
-                
-                if state_message:
-                    status_parts.append(f"💬 Message: {state_message}")
-                
-                # Add task information if available
-                if 'tasks' in result:
-                    tasks = result['tasks']
-                    if tasks:
-                        task = tasks[0]  # Usually one task per job
-                        task_state = task.get('state', {})
-                        task_life_cycle = task_state.get('life_cycle_state', 'UNKNOWN')
-                        task_result = task_state.get('result_state', 'UNKNOWN')
-                        status_parts.append(f"🔧 Task Status: {task_life_cycle} / {task_result}")
-                
-                status_text = "\n".join(status_parts)
-                
-                # Update UI
-                self.root.after(0, lambda: self._update_job_status(status_text))
-                
-                # Check if job is complete
-                if life_cycle_state in ['TERMINATED', 'SKIPPED', 'INTERNAL_ERROR']:
-                    self.monitoring_active = False
-                    if result_state == 'SUCCESS':
-                        self.root.after(0, lambda: self._job_completed_successfully(run_id))
-                    else:
-                        self.root.after(0, lambda: self._job_completed_with_error(run_id, result_state, state_message))
-                else:
-                    # Continue monitoring - check again in 10 seconds
-                    self.root.after(10000, lambda: self._monitor_job_progress(run_id))
+                result = json_loads(response.content)
+                self.root.after(0, lambda: self._on_job_status(run_id, result))
             else:
                 error_msg = f"Failed to check job status: {response.status_code} - {response.text}"
-                self.root.after(0, lambda: self._job_failed(error_msg))
-                self.monitoring_active = False
+                self.root.after(0, lambda: self._on_job_poll_failed(run_id, error_msg))
                 
         except Exception as e:
             error_msg = f"Error monitoring job: {str(e)}"
-            self.root.after(0, lambda: self._job_failed(error_msg))
+            self.root.after(0, lambda: self._on_job_poll_failed(run_id, error_msg))
+    
+    def _on_job_status(self, run_id, result):
+        """Apply a polled job run status on the UI thread and schedule the next poll"""
+        # The poll may have been in flight when a newer run started
+        if not self.monitoring_active or run_id != self.current_run_id:
+            return
+        
+        status_text, is_terminal, result_state = self._format_run_state(result)
+        state_message = result.get('state', {}).get('state_message', '')
+        self._last_run_state = (status_text, is_terminal, result_state)
+        
+        # Update UI
+        self._update_job_status(status_text)
+        
+        # Check if job is complete
+        if is_terminal:
             self.monitoring_active = False
+            if result_state == 'SUCCESS':
+                self._job_completed_successfully(run_id)
+            else:
+                self._job_completed_with_error(run_id, result_state, state_message)
+        else:
+            # Continue monitoring - back off from 1s up to 30s between polls
+            self.root.after(self._poll_interval_ms, lambda: self._monitor_job_progress(run_id))
+            self._poll_interval_ms = min(self._poll_interval_ms * 2, 30000)
+    
+    def _on_job_poll_failed(self, run_id, error_msg):
+        """Stop monitoring after a failed status poll"""
+        if self.monitoring_active and run_id == self.current_run_id:
+            self._job_failed(error_msg)
+    
+    def _format_run_state(self, run):
+        """Build status text for a Jobs API run; returns (status_text, is_terminal, result_state)"""
+        state = run.get('state', {})
+        life_cycle_state = state.get('life_cycle_state', 'UNKNOWN')
+        result_state = state.get('result_state', 'UNKNOWN')
+        state_message = state.get('state_message', '')
+        start_time = run.get('start_time', 0)
+        end_time = run.get('end_time', 0)
+        
+        # Format timestamps
+        start_str = 'N/A'
+        if start_time:
+            start_dt = datetime.fromtimestamp(start_time / 1000)
+            start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        end_str = 'N/A'
+        if end_time:
+            end_dt = datetime.fromtimestamp(end_time / 1000)
+            end_str = end_dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Create user-friendly status message
+        status_parts = [f"🆔 Run ID: {run.get('run_id')}"]
+        
+        # Show user-friendly status based on result_state, falling back to
+        # the lifecycle state for running or unknown results
+        status_parts.append(
+            RESULT_STATUS.get(result_state)
+            or LIFECYCLE_STATUS.get(life_cycle_state, f"❓ Status: {life_cycle_state}")
+        )
+        
+        status_parts.append(f"🕐 Started: {start_str}")
+        
+        if end_time:
+            status_parts.append(f"🕐 Ended: {end_str}")
+        
+        # Add duration if both times are available
+        if start_time and end_time:
+            duration_seconds = (end_time - start_time) / 1000
+            if duration_seconds < 60:
+                duration_str = f"{duration_seconds:.1f}s"
+            elif duration_seconds < 3600:
+                duration_str = f"{duration_seconds/60:.1f}m"
+            else:
+                duration_str = f"{duration_seconds/3600:.1f}h"
+            status_parts.append(f"⏱️ Duration: {duration_str}")
+        
+        if state_message:
+            status_parts.append(f"💬 Message: {state_message}")
+        
+        # Add task information if available
+        tasks = run.get('tasks')
+        if tasks:
+            task = tasks[0]  # Usually one task per job
+            task_state = task.get('state', {})
+            task_life_cycle = task_state.get('life_cycle_state', 'UNKNOWN')
+            task_result = task_state.get('result_state', 'UNKNOWN')
+            status_parts.append(f"🔧 Task Status: {task_life_cycle} / {task_result}")
+        
+        is_terminal = life_cycle_state in ('TERMINATED', 'SKIPPED', 'INTERNAL_ERROR')
+        return "\n".join(status_parts), is_terminal, result_state
     
     def _update_job_status(self, status_text):
         """Update the job status label"""
         self.job_status_label.config(text=status_text)
-        self.root.update()
     
     def _job_completed_successfully(self, run_id):
         """Handle successful job completion"""
@@ -1025,7 +1714,11 @@ class CreativePreviewerApp:
             # Disable button and show status
             self.check_job_status_button.config(state='disabled')
             self.job_status_label.config(text="🔄 Checking job status...")
-            self.root.update()
+            
+            # The job monitor is already polling the current run; reuse its latest result
+            if self.monitoring_active and self._last_run_state:
+                self._status_check_completed(self._last_run_state[0])
+                return
             
             # Check status in background thread
             threading.Thread(target=self._check_job_status_thread, daemon=True).start()
@@ -1041,83 +1734,20 @@ class CreativePreviewerApp:
             # Get recent runs
             api_url = f"{DATABRICKS_WORKSPACE_URL}/api/2.1/jobs/runs/list"
             
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json"
-            }
-            
             params = {
                 "limit": 5,
                 "offset": 0,
                 "job_id": JOB_ID
             }
             
-            response = requests.get(api_url, headers=headers, params=params, timeout=30)
+            response = self.http.get(api_url, params=params, timeout=30)
             
             if response.status_code == 200:
-                job_runs = response.json()
+                job_runs = json_loads(response.content)
                 runs = job_runs.get('runs', [])
                 
                 if runs:
-                    latest_run = runs[0]  # Most recent run
-                    run_id = latest_run.get('run_id')
-                    state = latest_run.get('state', {})
-                    life_cycle_state = state.get('life_cycle_state', 'UNKNOWN')
-                    result_state = state.get('result_state', 'UNKNOWN')
-                    start_time = latest_run.get('start_time', 0)
-                    end_time = latest_run.get('end_time', 0)
-                    
-                    # Format timestamps
-                    start_str = 'N/A'
-                    if start_time:
-                        start_dt = datetime.fromtimestamp(start_time / 1000)
-                        start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    end_str = 'N/A'
-                    if end_time:
-                        end_dt = datetime.fromtimestamp(end_time / 1000)
-                        end_str = end_dt.strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    # Create user-friendly status message
-                    status_parts = [f"🆔 Run ID: {run_id}"]
-                    
-                    # Show user-friendly status based on result_state
-                    if result_state == 'SUCCESS':
-                        status_parts.append("✅ Status: Completed Successfully")
-                    elif result_state == 'FAILED':
-                        status_parts.append("❌ Status: Failed")
-                    elif result_state == 'CANCELLED':
-                        status_parts.append("⚠️ Status: Cancelled")
-                    elif result_state == 'TIMEDOUT':
-                        status_parts.append("⏰ Status: Timed Out")
-                    else:
-                        # For running or unknown states, show lifecycle state
-                        if life_cycle_state == 'RUNNING':
-                            status_parts.append("🔄 Status: Running")
-                        elif life_cycle_state == 'PENDING':
-                            status_parts.append("⏳ Status: Pending")
-                        elif life_cycle_state == 'TERMINATED':
-                            status_parts.append("✅ Status: Completed")
-                        else:
-                            status_parts.append(f"❓ Status: {life_cycle_state}")
-                    
-                    status_parts.append(f"🕐 Started: {start_str}")
-                    
-                    if end_time:
-                        status_parts.append(f"🕐 Ended: {end_str}")
-                    
-                    # Add duration if both times are available
-                    if start_time and end_time:
-                        duration_seconds = (end_time - start_time) / 1000
-                        if duration_seconds < 60:
-                            duration_str = f"{duration_seconds:.1f}s"
-                        elif duration_seconds < 3600:
-                            duration_str = f"{duration_seconds/60:.1f}m"
-                        else:
-                            duration_str = f"{duration_seconds/3600:.1f}h"
-                        status_parts.append(f"⏱️ Duration: {duration_str}")
-                    
-                    status_text = "\n".join(status_parts)
+                    status_text, _, _ = self._format_run_state(runs[0])  # Most recent run
                     
                     self.root.after(0, lambda: self._status_check_completed(status_text))
                 else:
@@ -1185,54 +1815,15 @@ class CreativePreviewerApp:
     
     def load_creatives(self):
         """Load creatives from Databricks in a separate thread"""
+        self.status_label.config(text="Loading creatives from Databricks...")
+        
         def load_thread():
             try:
-                self.status_label.config(text="Loading creatives from Databricks...")
+                creatives = self._fetch_creatives_blocking()
                 
-                # Databricks connection
-                connection_params = {
-                    "server_hostname": DATABRICKS_SERVER_HOSTNAME,
-                    "http_path": DATABRICKS_HTTP_PATH,
-                    "access_token": self.access_token
-                }
+                # Update UI in main thread
+                self.root.after(0, self.on_data_loaded, creatives)
                 
-                with sql.connect(**connection_params) as connection:
-                    with connection.cursor() as cursor:
-                        # Query to get creatives with day column
-                        query = f"""
-                        SELECT day, creativeId, adSize, type, markup 
-                        FROM {DATABRICKS_TABLE_NAME} 
-                        ORDER BY day DESC
-                        LIMIT 500
-                        """
-                        
-                        cursor.execute(query)
-                        results = cursor.fetchall()
-                        
-                        # Process results
-                        creatives = []
-                        for row in results:
-                            day, creative_id, ad_size, ad_type, markup = row
-                            
-                            # Parse ad_size to get width and height
-                            size_parts = ad_size.split('x') if ad_size else ['0', '0']
-                            width = size_parts[0] if len(size_parts) > 0 else '0'
-                            height = size_parts[1] if len(size_parts) > 1 else '0'
-                            
-                            creative = {
-                                'day': day,
-                                'id': creative_id,
-                                'size': ad_size,
-                                'width': width,
-                                'height': height,
-                                'type': ad_type,
-                                'markup': markup
-                            }
-                            creatives.append(creative)
-                        
-                        # Update UI in main thread
-                        self.root.after(0, self.on_data_loaded, creatives)
-                        
             except Exception as e:
                 error_msg = f"Error loading creatives: {str(e)}"
                 print(f"❌ {error_msg}")
@@ -1242,9 +1833,103 @@ class CreativePreviewerApp:
         thread = threading.Thread(target=load_thread, daemon=True)
         thread.start()
     
+    def _fetch_creatives_blocking(self):
+        """Run the creatives query and return the rows as Creatives"""
+        # Query to get creatives with day column
+        query = f"""
+        SELECT day, creativeId, adSize, type 
+        FROM {DATABRICKS_TABLE_NAME} 
+        WHERE day >= date_sub(current_date(), 7)
+        ORDER BY day DESC
+        LIMIT 500
+        """
+        
+        return self._execute(query, fetch=lambda cursor: Creatives.from_arrow(cursor.fetchall_arrow()))
+    
+    def _drain_load_future(self):
+        """Poll the startup query and show its result once it's done"""
+        if not self._load_future.done():
+            self.root.after(50, self._drain_load_future)
+            return
+        
+        try:
+            creatives = self._load_future.result()
+        except Exception as e:
+            error_msg = f"Error loading creatives: {str(e)}"
+            print(f"❌ {error_msg}")
+            self.on_error(error_msg)
+            return
+        
+        self.on_data_loaded(creatives)
+    
+    @contextmanager
+    def _get_conn(self, fresh=False):
+        """Check out a pooled Databricks connection, opening one if none are idle or fresh is set"""
+        try:
+            connection = None if fresh else self._db_pool.get_nowait()
+        except queue.Empty:
+            connection = None
+        if connection is None:
+            connection = sql.connect(
+                server_hostname=DATABRICKS_SERVER_HOSTNAME,
+                http_path=DATABRICKS_HTTP_PATH,
+                access_token=self.access_token
+            )
+        
+        try:
+            yield connection
+        except Exception:
+            # Don't hand a possibly broken connection to the next query
+            connection.close()
+            raise
+        
+        try:
+            self._db_pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+    
+    def _execute(self, query, params=None, fetch=lambda cursor: cursor.fetchall()):
+        """Run a query on a pooled connection and return fetch(cursor)"""
+        for attempt in range(2):
+            connection = None
+            try:
+                with self._get_conn(fresh=attempt > 0) as connection:
+                    with connection.cursor() as cursor:
+                        cursor.execute(query, params)
+                        return fetch(cursor)
+            # Only connection-level failures; OSError covers dropped sockets and ConnectionError.
+            # SQL, binding and server errors would just fail the same way again.
+            except (sql.OperationalError, sql.InterfaceError, OSError):
+                # An idle pooled connection may have expired. _get_conn has closed it, so
+                # retry once on a newly opened one and leave the rest of the pool alone.
+                # A failed connect (bad token, warehouse unreachable) isn't worth repeating.
+                if attempt or connection is None:
+                    raise
+    
+    def _set_access_token(self, token):
+        """Switch to a new Databricks token for SQL and Jobs API calls"""
+        self.access_token = token
+        self.http.headers["Authorization"] = f"Bearer {token}"
+        # Pooled connections were opened with the old token
+        self._close_db_pool()
+    
+    def _close_db_pool(self):
+        """Close all idle pooled Databricks connections"""
+        while True:
+            try:
+                connection = self._db_pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except Exception as e:
+                print(f"⚠️ Error closing Databricks connection: {e}")
+    
     def on_data_loaded(self, creatives):
         """Handle loaded creatives data"""
         self.creatives = creatives
+        # Markup may have changed in the table since it was cached
+        self._fetch_markup.cache_clear()
         self.update_creative_list()
         self.status_label.config(text=f"✅ Loaded {len(creatives)} creatives")
         print(f"✅ SUCCESS: Loaded {len(creatives)} creatives from Databricks")
@@ -1265,7 +1950,7 @@ class CreativePreviewerApp:
             if retry:
                 new_token = self.prompt_for_token()
                 if new_token:
-                    self.access_token = new_token
+                    self._set_access_token(new_token)
                     print("🔄 Retrying with new token...")
                     self.load_creatives()
                     return
@@ -1274,52 +1959,39 @@ class CreativePreviewerApp:
     
     def update_creative_list(self):
         """Update the creative listbox"""
-        self.creative_listbox.delete(0, tk.END)
-        for creative in self.creatives:
-            # Format the date nicely - handle different date types
-            try:
-                if creative['day']:
-                    if hasattr(creative['day'], 'strftime'):
-                        # It's a datetime object
-                        day_str = creative['day'].strftime('%m/%d')
-                    else:
-                        # It's a string or other type
-                        day_str = str(creative['day'])[:10]  # Take first 10 chars for date
-                else:
-                    day_str = 'N/A'
-            except Exception as e:
-                day_str = 'N/A'
-                print(f"⚠️ Date formatting error: {e}")
-            
-            display_text = f"{day_str} | {creative['id']} | {creative['size']} | {creative['type']}"
-            self.creative_listbox.insert(tk.END, display_text)
+        # An unfiltered view maps listbox positions straight to rows
+        self._last_search = ""
+        self._show_rows(range(len(self.creatives)))
+    
+    def _schedule_filter(self, *args):
+        """Debounce search edits so the filter runs once the user pauses"""
+        if self._filter_job:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(150, self._do_filter)
     
-    def filter_creatives(self, *args):
+    def _do_filter(self):
         """Filter creatives based on search term"""
+        self._filter_job = None
+        if self.creatives is None:
+            return
         search_term = self.search_var.get().lower()
-        self.creative_listbox.delete(0, tk.END)
+        if search_term == self._last_search:
+            # e.g. a character typed and deleted within the debounce window
+            return
         
-        for creative in self.creatives:
-            # Format the date nicely - handle different date types
-            try:
-                if creative['day']:
-                    if hasattr(creative['day'], 'strftime'):
-                        # It's a datetime object
-                        day_str = creative['day'].strftime('%m/%d')
-                    else:
-                        # It's a string or other type
-                        day_str = str(creative['day'])[:10]
-                else:
-                    day_str = 'N/A'
-            except Exception as e:
-                day_str = 'N/A'
-            
-            if (search_term in str(creative['id']).lower() or 
-                search_term in creative['size'].lower() or 
-                search_term in str(creative['type']).lower() or
-                search_term in day_str.lower()):
-                display_text = f"{day_str} | {creative['id']} | {creative['size']} | {creative['type']}"
-                self.creative_listbox.insert(tk.END, display_text)
+        # A longer term can only match rows the previous term matched
+        candidates = None
+        if self._last_search and search_term.startswith(self._last_search):
+            candidates = self._visible_rows
+        
+        self._last_search = search_term
+        self._show_rows(self.creatives.match(search_term, candidates))
+    
+    def _show_rows(self, rows):
+        """Fill the listbox with the given creative rows"""
+        self._visible_rows = rows
+        # Assigning a tuple hands Tcl a ready-made list in a single call
+        self._items_var.set(tuple(self.creatives.format_rows(rows)) if rows else ())
     
     def refresh_database(self):
         """Refresh the database and reload creatives"""
@@ -1348,68 +2020,74 @@ class CreativePreviewerApp:
             
             messagebox.showerror("Refresh Error", error_msg)
     
-    def on_creative_select(self, event):
+    def on_creative_select(self, event, preview=False):
         """Handle creative selection"""
         selection = self.creative_listbox.curselection()
         if selection:
             index = selection[0]
-            # Find the creative in the filtered list
-            search_term = self.search_var.get().lower()
-            filtered_creatives = []
-            
-            for c in self.creatives:
-                # Format the date for search
-                try:
-                    if c['day']:
-                        if hasattr(c['day'], 'strftime'):
-                            day_str = c['day'].strftime('%m/%d')
-                        else:
-                            day_str = str(c['day'])[:10]
-                    else:
-                        day_str = 'N/A'
-                except Exception:
-                    day_str = 'N/A'
-                
-                if (search_term in str(c['id']).lower() or 
-                    search_term in c['size'].lower() or 
-                    search_term in str(c['type']).lower() or
-                    search_term in day_str.lower()):
-                    filtered_creatives.append(c)
-            
-            if index < len(filtered_creatives):
-                self.selected_creative = filtered_creatives[index]
-                self.display_creative()
+            # Map the listbox position back to its creative row
+            if index < len(self._visible_rows):
+                self.selected_creative = self.creatives.row(self._visible_rows[index])
+                self.display_creative(preview)
     
     def on_creative_double_click(self, event):
         """Handle creative double-click - show preview"""
-        self.on_creative_select(event)
-        if self.selected_creative:
-            self.show_preview()
+        self.on_creative_select(event, preview=True)
+    
+    def _query_markup(self, creative_id, day, size, creative_type):
+        """Fetch the markup for a single creative row from Databricks"""
+        # Match the whole listed row; one creative ID can have several sizes/types per day
+        query = f"""
+        SELECT markup 
+        FROM {DATABRICKS_TABLE_NAME} 
+        WHERE creativeId = :creative_id AND day <=> :day AND adSize <=> :size AND type <=> :type
+        LIMIT 1
+        """
+        
+        params = {"creative_id": creative_id, "day": day, "size": size, "type": creative_type}
+        row = self._execute(query, params, fetch=lambda cursor: cursor.fetchone())
+        return row[0] if row else None
     
-    def display_creative(self):
-        """Display the selected creative"""
+    def display_creative(self, preview=False):
+        """Display the selected creative, fetching its markup in the background"""
         if not self.selected_creative:
             return
         
-        print("🎨 Displaying creative...")
-        print(f"📄 Creative ID: {self.selected_creative['id']}")
-        print(f"📅 Date: {self.selected_creative['day']}")
-        print(f"📏 Size: {self.selected_creative['size']}")
-        print(f"🎬 Type: {self.selected_creative['type']}")
-        print(f"📝 Markup length: {len(self.selected_creative['markup']) if self.selected_creative['markup'] else 0}")
+        creative = self.selected_creative
+        logger.debug("🎨 Displaying creative...")
+        logger.debug("📄 Creative ID: %s", creative['id'])
+        logger.debug("📅 Date: %s", creative['day'])
+        logger.debug("📏 Size: %s", creative['size'])
+        logger.debug("🎬 Type: %s", creative['type'])
+        
+        def fetch_thread():
+            try:
+                markup = self._fetch_markup(creative['id'], creative['day'], creative['size'], creative['type'])
+            except Exception as e:
+                logger.error("❌ Error loading markup: %s", e)
+                markup = None
+            logger.debug("📝 Markup length: %s", len(markup) if markup else 0)
+            
+            # Parse here too; large VAST markup would otherwise block the UI
+            parsed_result = self.parse_ad_response(markup)
+            self.root.after(0, self._apply_parsed, creative, parsed_result, preview)
         
-        # Parse the markup
-        parsed_result = self.parse_ad_response(self.selected_creative['markup'])
+        threading.Thread(target=fetch_thread, daemon=True).start()
+    
+    def _apply_parsed(self, creative, parsed_result, preview):
+        """Show parsed markup if its creative is still selected"""
+        if creative is not self.selected_creative:
+            return
         
         if parsed_result.get('error'):
-            print(f"❌ Failed to parse creative: {parsed_result['error']}")
+            logger.error("❌ Failed to parse creative: %s", parsed_result['error'])
             self.current_markup = ""
             self.current_type = "unknown"
         else:
             self.current_markup = parsed_result.get('creative', '')
             self.current_type = parsed_result.get('type', 'display')
-            print(f"✅ Parsed creative type: {self.current_type}")
-            print(f"✅ Parsed markup length: {len(self.current_markup)}")
+            logger.debug("✅ Parsed creative type: %s", self.current_type)
+            logger.debug("✅ Parsed markup length: %s", len(self.current_markup))
         
         # Update info display
         info_text = f"""Creative ID: {self.selected_creative['id']}
@@ -1421,25 +2099,36 @@ Markup Length: {len(self.current_markup)} characters
 Raw Type: {self.selected_creative['type']}
 Raw Size: {self.selected_creative['size']}"""
         
-        self.info_text.delete(1.0, tk.END)
-        self.info_text.insert(1.0, info_text)
+        self.info_text.replace(1.0, tk.END, info_text)
         
         # Update markup display
-        self.markup_text.delete(1.0, tk.END)
-        if self.current_markup:
-            self.markup_text.insert(1.0, self.current_markup)
+        self._show_markup_text(self.current_markup)
+        
+        if preview:
+            self.show_preview()
+    
+    def _parse_xml(self, xml_string):
+        """Parse XML text or raw bytes with lxml when available, else ElementTree; raises ET.ParseError"""
+        if lxml_etree is None:
+            return ET.fromstring(xml_string)
+        
+        try:
+            return lxml_etree.fromstring(_xml_bytes(xml_string), _XML_PARSER)
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from e
     
     def parse_ad_response(self, xml_string):
         """Parse ad response XML - same logic as React app"""
         if not xml_string:
             return {'error': 'No XML content provided'}
         
-        print(f"🔍 Parsing XML string of length: {len(xml_string)}")
-        print(f"📄 First 200 chars: {xml_string[:200]}...")
+        logger.debug("🔍 Parsing XML string of length: %s", len(xml_string))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📄 First 200 chars: %s...", xml_string[:200])
         
         try:
             # Parse XML
-            root = ET.fromstring(xml_string)
+            root = self._parse_xml(xml_string)
             
             # Extract dimensions and type
             width = None
@@ -1449,37 +2138,47 @@ Raw Size: {self.selected_creative['size']}"""
             # Look for namespace-aware elements
             TNS_NAMESPACE_URI = "http://www.inner-active.com/SimpleM2M/M2MResponse"
             
-            # Try to find elements with namespace
-            width_elem = root.find(f'.//{{{TNS_NAMESPACE_URI}}}AdWidth')
-            height_elem = root.find(f'.//{{{TNS_NAMESPACE_URI}}}AdHeight')
-            type_elem = root.find(f'.//{{{TNS_NAMESPACE_URI}}}AdType')
-            
-            if width_elem is not None:
-                width = width_elem.get('Value')
-            if height_elem is not None:
-                height = height_elem.get('Value')
-            if type_elem is not None:
-                ad_type = type_elem.get('Value')
+            width_tag = f'{{{TNS_NAMESPACE_URI}}}AdWidth'
+            height_tag = f'{{{TNS_NAMESPACE_URI}}}AdHeight'
+            type_tag = f'{{{TNS_NAMESPACE_URI}}}AdType'
+            ad_tag = f'{{{TNS_NAMESPACE_URI}}}Ad'
+            
+            # Collect everything in one walk instead of a subtree search per element
+            ad_elem = None
+            plain_ad_elem = None  # Fallback without namespace
+            for elem in root.iter():
+                tag = elem.tag
+                if tag == width_tag:
+                    width = elem.get('Value') if width is None else width
+                elif tag == height_tag:
+                    height = elem.get('Value') if height is None else height
+                elif tag == type_tag:
+                    ad_type = elem.get('Value') if ad_type is None else ad_type
+                elif tag == ad_tag:
+                    ad_elem = elem if ad_elem is None else ad_elem
+                elif tag == 'Ad' and plain_ad_elem is None:
+                    plain_ad_elem = elem
+                
+                if ad_elem is not None and None not in (width, height, ad_type):
+                    break
             
-            print(f"📏 Width: {width}, Height: {height}, Type: {ad_type}")
+            logger.debug("📏 Width: %s, Height: %s, Type: %s", width, height, ad_type)
             
-            # Find Ad element
-            ad_elem = root.find(f'.//{{{TNS_NAMESPACE_URI}}}Ad')
             if ad_elem is None:
-                ad_elem = root.find('.//Ad')  # Fallback without namespace
+                ad_elem = plain_ad_elem
             
             if ad_elem is None:
                 return {'error': 'No Ad element found'}
             
-            print("✅ Found Ad element")
+            logger.debug("✅ Found Ad element")
             
             # Extract CDATA content
             cdata_content = None
-            print("🔍 Looking for CDATA content...")
+            logger.debug("🔍 Looking for CDATA content...")
             
             # Look for CDATA sections
             for child in ad_elem:
-                if child.tag is ET.Comment:
+                if not isinstance(child.tag, str):  # Comments and PIs
                     continue
                 if child.text and child.text.strip():
                     cdata_content = child.text.strip()
@@ -1488,14 +2187,14 @@ Raw Size: {self.selected_creative['size']}"""
             # Fallback to text content
             if not cdata_content:
                 cdata_content = ad_elem.text.strip() if ad_elem.text else ""
-                print(f"📝 Using text content: {len(cdata_content)} chars")
+                logger.debug("📝 Using text content: %s chars", len(cdata_content))
             
             if not cdata_content:
                 return {'error': 'No CDATA content found'}
             
             # Process based on AdType
             if ad_type == '4':  # Display Ad
-                print("✅ Processed as display ad")
+                logger.debug("✅ Processed as display ad")
                 creative = self.decode_html_entities(cdata_content)
                 return {
                     'type': 'display',
@@ -1504,7 +2203,7 @@ Raw Size: {self.selected_creative['size']}"""
                     'height': height
                 }
             elif ad_type == '8':  # VAST Ad
-                print("✅ Processed as VAST ad")
+                logger.debug("✅ Processed as VAST ad")
                 creative = self.decode_html_entities(cdata_content)
                 return {
                     'type': 'vast',
@@ -1513,11 +2212,13 @@ Raw Size: {self.selected_creative['size']}"""
                     'height': height
                 }
             else:
-                # Unknown type - try to determine from content
-                print(f"🎯 Final result - Type: display, Creative length: {len(cdata_content)}")
+                # Unknown type - try to determine from content; VAST documents
+                # open with <VAST, so skimming the head avoids another parse
                 creative = self.decode_html_entities(cdata_content)
+                detected_type = 'vast' if '<VAST' in creative[:4096] else 'display'
+                logger.debug("🎯 Final result - Type: %s, Creative length: %s", detected_type, len(cdata_content))
                 return {
-                    'type': 'display',
+                    'type': detected_type,
                     'creative': creative,
                     'width': width,
                     'height': height
@@ -1530,65 +2231,41 @@ Raw Size: {self.selected_creative['size']}"""
     
     def decode_html_entities(self, text):
         """Decode HTML entities"""
-        if not text:
-            return text
-        
-        # Use html.unescape for basic entities
-        decoded = html.unescape(text)
-        
-        # Additional replacements for common entities
-        replacements = {
-            '&nbsp;': ' ',
-            '&#39;': "'",
-            '&#34;': '"',
-            '&#60;': '<',
-            '&#62;': '>',
-            '&#38;': '&',
-            '&#160;': ' '
-        }
-        
-        for entity, replacement in replacements.items():
-            decoded = decoded.replace(entity, replacement)
-        
-        return decoded
+        # html.unescape covers every named and numeric entity in one pass
+        return html.unescape(text) if text else text
     
-    def extract_vast_url(self, markup):
-        """Extract VAST URL from markup - following the React app approach"""
-        import re
-        import html
-        from xml.etree import ElementTree as ET
-        
+    def extract_vast_urls(self, markup):
+        """Extract video and click-through URLs from VAST markup in one pass - following the React app approach"""
         # First, look for VASTAdTagURI (this is the VAST XML endpoint for wrapper VAST)
-        vast_ad_tag_patterns = [
-            r'<VASTAdTagURI><!\[CDATA\[(.*?)\]\]></VASTAdTagURI>',
-            r'<VASTAdTagURI>(.*?)</VASTAdTagURI>'
-        ]
-        
-        for pattern in vast_ad_tag_patterns:
-            match = re.search(pattern, markup, re.IGNORECASE)
+        for pattern in _VAST_TAG_URI_RES:
+            match = pattern.search(markup)
             if match:
                 vast_xml_url = match.group(1)
                 # Decode HTML entities in the URL
                 vast_xml_url = html.unescape(vast_xml_url)
-                print(f"🎯 Found VAST XML URL (wrapper): {vast_xml_url}")
+                logger.debug("🎯 Found VAST XML URL (wrapper): %s", vast_xml_url)
                 
                 # Follow the VAST chain like the React app does
                 try:
-                    return self._process_vast_chain(vast_xml_url)
+                    resolved = self._resolve_vast_chain(vast_xml_url)
                 except Exception as e:
-                    print(f"❌ Error processing VAST chain: {e}")
-                    return vast_xml_url  # Fallback to original URL
+                    logger.error("❌ Error processing VAST chain: %s", e)
+                    # Fallback to original URL and any click-through in the markup
+                    return vast_xml_url, self._extract_click_through_from_markup(markup)
+                
+                return resolved['video_url'] or vast_xml_url, resolved['click_through_url']
         
         # If no VASTAdTagURI found, this might be a direct VAST response
-        print("🔍 No VASTAdTagURI found, checking for direct MediaFile...")
-        
+        logger.debug("🔍 No VASTAdTagURI found, checking for direct MediaFile...")
+        return self._extract_direct_media_url(markup), self._extract_click_through_from_markup(markup)
+    
+    def _extract_direct_media_url(self, markup):
+        """Extract the MediaFile URL from non-wrapper VAST markup"""
         # Try to parse the markup as XML to find MediaFile
         try:
-            # Clean up the markup first (remove CDATA if present)
-            clean_markup = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', markup)
-            
-            # Parse as XML
-            root = ET.fromstring(clean_markup)
+            # Parse as XML; CDATA sections come through as element text, so
+            # URLs containing '<' or '&' inside them survive intact
+            root = self._parse_xml(markup)
             
             # Look for MediaFile elements
             media_files = []
@@ -1608,65 +2285,87 @@ Raw Size: {self.selected_creative['size']}"""
                 # Sort by bitrate (highest first) like the React app
                 media_files.sort(key=lambda x: x['bitrate'], reverse=True)
                 primary_video = media_files[0]
-                print(f"🎬 Found direct MediaFile URL: {primary_video['url']}")
+                logger.debug("🎬 Found direct MediaFile URL: %s", primary_video['url'])
                 return primary_video['url']
                 
         except ET.ParseError as e:
-            print(f"❌ Error parsing markup as XML: {e}")
+            logger.error("❌ Error parsing markup as XML: %s", e)
         
         # Fallback: look for direct MediaFile URLs using regex
-        direct_media_patterns = [
-            r'<MediaFile[^>]*><!\[CDATA\[(.*?)\]\]></MediaFile>',
-            r'<MediaFile[^>]*>(.*?)</MediaFile>',
-            r'<URL><!\[CDATA\[(.*?)\]\]></URL>',
-            r'<URL>(.*?)</URL>'
-        ]
-        
-        for pattern in direct_media_patterns:
-            match = re.search(pattern, markup, re.IGNORECASE)
+        for pattern in _DIRECT_MEDIA_RES:
+            match = pattern.search(markup)
             if match:
                 media_url = match.group(1).strip()
                 if media_url and (media_url.endswith('.mp4') or 'video' in media_url):
-                    print(f"🎬 Found direct MediaFile URL (regex): {media_url}")
+                    logger.debug("🎬 Found direct MediaFile URL (regex): %s", media_url)
                     return media_url
         
-        print("❌ No VAST URL found in markup")
+        logger.warning("❌ No VAST URL found in markup")
         return None
     
-    def _process_vast_chain(self, vast_url, wrapper_count=0):
-        """Process VAST chain recursively like the React app - follows wrappers to find InLine"""
+    def _extract_click_through_from_markup(self, markup):
+        """Look for a click-through URL directly in the markup"""
+        for pattern in _CLICK_RES:
+            match = pattern.search(markup)
+            if match:
+                return match.group(1)
+        
+        return None
+    
+    def _resolve_vast_chain(self, vast_url, wrapper_count=0):
+        """Follow VAST wrappers to the InLine ad; returns its video_url and click_through_url"""
         MAX_VAST_WRAPPERS = 5
         
         if wrapper_count > MAX_VAST_WRAPPERS:
             raise Exception('Exceeded maximum VAST wrapper redirects')
         
-        print(f"🔄 Processing VAST Chain - Level {wrapper_count}")
+        # Creatives often share wrapper endpoints, so reuse earlier resolutions
+        with self._vast_cache_lock:
+            if vast_url in self._vast_cache:
+                self._vast_cache.move_to_end(vast_url)
+                logger.debug("♻️ Using cached VAST chain for: %s", vast_url)
+                return self._vast_cache[vast_url]
+        
+        logger.debug("🔄 Processing VAST Chain - Level %s", wrapper_count)
         
         try:
             # Fetch VAST XML
-            response = requests.get(vast_url, timeout=10)
+            with self._vast_cache_lock:
+                host_slot = self._vast_host_slots[urlsplit(vast_url).netloc]
+            with host_slot:
+                response = self._vast_http.get(vast_url, timeout=VAST_TIMEOUT)
             if response.status_code != 200:
                 raise Exception(f"Failed to fetch VAST XML: {response.status_code}")
             
-            vast_xml = response.text
-            print(f"📄 Fetched VAST XML: {len(vast_xml)} chars")
+            # Raw bytes, so the parser honours the document's declared encoding
+            vast_xml = response.content
+            logger.debug("📄 Fetched VAST XML: %s bytes", len(vast_xml))
             
             # Parse XML
             try:
-                root = ET.fromstring(vast_xml)
+                root = self._parse_xml(vast_xml)
             except ET.ParseError as e:
                 raise Exception(f"Invalid XML: {e}")
             
             # Check for InLine (final ad)
             inline_ad = root.find('.//InLine')
             if inline_ad is not None:
-                print("✅ Found InLine VAST. Extracting video URL...")
+                logger.debug("✅ Found InLine VAST. Extracting video and click-through URLs...")
                 
                 # Find Linear creative
                 linear = inline_ad.find('.//Linear')
                 if linear is None:
                     raise Exception('InLine VAST does not contain a Linear creative')
                 
+                # Find VideoClicks and ClickThrough
+                click_url = None
+                video_clicks = linear.find('.//VideoClicks')
+                if video_clicks is not None:
+                    click_through = video_clicks.find('.//ClickThrough')
+                    if click_through is not None and click_through.text:
+                        click_url = click_through.text.strip()
+                        logger.debug("🔗 Found click-through URL: %s", click_url)
+                
                 # Find MediaFile with video/mp4 or .mp4 extension
                 media_files = []
                 for media_file in linear.findall('.//MediaFile'):
@@ -1681,138 +2380,47 @@ Raw Size: {self.selected_creative['size']}"""
                             'bitrate': bitrate
                         })
                 
-                if not media_files:
-                    raise Exception('No MP4 MediaFile found in InLine VAST')
-                
-                # Sort by bitrate (highest first) like the React app
-                media_files.sort(key=lambda x: x['bitrate'], reverse=True)
-                primary_video = media_files[0]
+                video_url = None
+                if media_files:
+                    # Sort by bitrate (highest first) like the React app
+                    media_files.sort(key=lambda x: x['bitrate'], reverse=True)
+                    video_url = media_files[0]['url']
+                    logger.debug("🎬 Found video URL: %s", video_url)
+                else:
+                    logger.warning("❌ No MP4 MediaFile found in InLine VAST")
                 
-                print(f"🎬 Found video URL: {primary_video['url']}")
-                return primary_video['url']
+                return self._cache_vast_result(vast_url, {'video_url': video_url, 'click_through_url': click_url})
             
             # Check for Wrapper (needs to fetch another VAST)
             wrapper_ad = root.find('.//Wrapper')
             if wrapper_ad is not None:
-                print(f"🔄 Found Wrapper {wrapper_count + 1}. Getting VASTAdTagURI...")
+                logger.debug("🔄 Found Wrapper %s. Getting VASTAdTagURI...", wrapper_count + 1)
                 
                 vast_ad_tag_uri = wrapper_ad.find('.//VASTAdTagURI')
                 if vast_ad_tag_uri is None or not vast_ad_tag_uri.text:
                     raise Exception('Wrapper VAST does not contain a VASTAdTagURI')
                 
                 next_vast_url = vast_ad_tag_uri.text.strip()
-                print(f"🔄 Following URI: {next_vast_url}")
+                logger.debug("🔄 Following URI: %s", next_vast_url)
                 
                 # Recursively process the next VAST
-                return self._process_vast_chain(next_vast_url, wrapper_count + 1)
+                return self._cache_vast_result(vast_url, self._resolve_vast_chain(next_vast_url, wrapper_count + 1))
             
             # Neither InLine nor Wrapper found
             raise Exception('VAST XML contains neither InLine nor Wrapper Ad element')
             
         except Exception as e:
-            print(f"❌ Error during VAST processing (Level {wrapper_count}): {e}")
+            logger.error("❌ Error during VAST processing (Level %s): %s", wrapper_count, e)
             raise
     
-    def extract_vast_click_through(self, markup):
-        """Extract click-through URL from VAST markup - following the React app approach"""
-        # First, look for VASTAdTagURI to get the VAST XML
-        vast_ad_tag_patterns = [
-            r'<VASTAdTagURI><!\[CDATA\[(.*?)\]\]></VASTAdTagURI>',
-            r'<VASTAdTagURI>(.*?)</VASTAdTagURI>'
-        ]
-        
-        for pattern in vast_ad_tag_patterns:
-            match = re.search(pattern, markup, re.IGNORECASE)
-            if match:
-                vast_xml_url = match.group(1)
-                # Decode HTML entities in the URL
-                vast_xml_url = html.unescape(vast_xml_url)
-                print(f"🎯 Looking for click-through in VAST: {vast_xml_url}")
-                
-                # Follow the VAST chain to find click-through
-                try:
-                    return self._extract_click_through_from_vast_chain(vast_xml_url)
-                except Exception as e:
-                    print(f"❌ Error extracting click-through from VAST chain: {e}")
-                    break
-        
-        # Fallback: look for direct click-through URLs in the original markup
-        click_patterns = [
-            r'<ClickThrough><!\[CDATA\[(.*?)\]\]></ClickThrough>',
-            r'<ClickThrough>(.*?)</ClickThrough>',
-            r'<ClickTracking><!\[CDATA\[(.*?)\]\]></ClickTracking>',
-            r'<ClickTracking>(.*?)</ClickTracking>'
-        ]
-        
-        for pattern in click_patterns:
-            match = re.search(pattern, markup, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return None
-    
-    def _extract_click_through_from_vast_chain(self, vast_url, wrapper_count=0):
-        """Extract click-through URL from VAST chain recursively"""
-        MAX_VAST_WRAPPERS = 5
-        
-        if wrapper_count > MAX_VAST_WRAPPERS:
-            raise Exception('Exceeded maximum VAST wrapper redirects')
-        
-        try:
-            # Fetch VAST XML
-            response = requests.get(vast_url, timeout=10)
-            if response.status_code != 200:
-                raise Exception(f"Failed to fetch VAST XML: {response.status_code}")
-            
-            vast_xml = response.text
-            
-            # Parse XML
-            try:
-                root = ET.fromstring(vast_xml)
-            except ET.ParseError as e:
-                raise Exception(f"Invalid XML: {e}")
-            
-            # Check for InLine (final ad)
-            inline_ad = root.find('.//InLine')
-            if inline_ad is not None:
-                print("✅ Found InLine VAST. Extracting click-through...")
-                
-                # Find Linear creative
-                linear = inline_ad.find('.//Linear')
-                if linear is None:
-                    raise Exception('InLine VAST does not contain a Linear creative')
-                
-                # Find VideoClicks and ClickThrough
-                video_clicks = linear.find('.//VideoClicks')
-                if video_clicks is not None:
-                    click_through = video_clicks.find('.//ClickThrough')
-                    if click_through is not None and click_through.text:
-                        click_url = click_through.text.strip()
-                        print(f"🔗 Found click-through URL: {click_url}")
-                        return click_url
-                
-                return None
-            
-            # Check for Wrapper (needs to fetch another VAST)
-            wrapper_ad = root.find('.//Wrapper')
-            if wrapper_ad is not None:
-                print(f"🔄 Found Wrapper {wrapper_count + 1}. Following for click-through...")
-                
-                vast_ad_tag_uri = wrapper_ad.find('.//VASTAdTagURI')
-                if vast_ad_tag_uri is None or not vast_ad_tag_uri.text:
-                    raise Exception('Wrapper VAST does not contain a VASTAdTagURI')
-                
-                next_vast_url = vast_ad_tag_uri.text.strip()
-                
-                # Recursively process the next VAST
-                return self._extract_click_through_from_vast_chain(next_vast_url, wrapper_count + 1)
-            
-            # Neither InLine nor Wrapper found
-            raise Exception('VAST XML contains neither InLine nor Wrapper Ad element')
-            
-        except Exception as e:
-            print(f"❌ Error during click-through extraction (Level {wrapper_count}): {e}")
-            raise
+    def _cache_vast_result(self, vast_url, resolved):
+        """Remember a resolved VAST chain, evicting the least recently used"""
+        with self._vast_cache_lock:
+            self._vast_cache[vast_url] = resolved
+            self._vast_cache.move_to_end(vast_url)
+            while len(self._vast_cache) > VAST_CACHE_SIZE:
+                self._vast_cache.popitem(last=False)
+        return resolved
     
     def show_preview(self):
         """Show preview in webview window"""
@@ -1831,87 +2439,24 @@ Raw Size: {self.selected_creative['size']}"""
             messagebox.showwarning("Warning", "No markup to preview!")
             return
         
-        # Create HTML content
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Display Ad Preview</title>
-            <style>
-                body {{ 
-                    margin: 0; 
-                    padding: 20px; 
-                    font-family: Arial, sans-serif; 
-                    background: #f5f5f5;
-                }}
-                .ad-container {{ 
-                    border: 2px solid #ddd; 
-                    border-radius: 8px;
-                    padding: 20px; 
-                    background: white;
-                    max-width: 100%;
-                    overflow: auto;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .ad-content {{ 
-                    max-width: 480px;
-                    max-height: 320px;
-                    margin: 0 auto;
-                    overflow: auto;
-                }}
-                .preview-header {{
-                    background: #007bff;
-                    color: white;
-                    padding: 10px 20px;
-                    margin: -20px -20px 20px -20px;
-                    border-radius: 6px 6px 0 0;
-                    font-weight: bold;
-                    font-size: 16px;
-                }}
-                .info-panel {{
-                    background: #e9ecef;
-                    border: 1px solid #dee2e6;
-                    border-radius: 4px;
-                    padding: 10px;
-                    margin: 10px 0;
-                    font-size: 12px;
-                    color: #495057;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="ad-container">
-                <div class="preview-header">
-                    🎨 Display Ad Preview - {self.selected_creative['size'] if self.selected_creative else 'Unknown'}
-                </div>
-                <div class="info-panel">
-                    <strong>Creative Info:</strong> ID: {self.selected_creative['id'] if self.selected_creative else 'Unknown'}, 
-                    Size: {self.selected_creative['size'] if self.selected_creative else 'Unknown'}, Type: {self.current_type}
-                </div>
-                <div class="ad-content">
-                    {self.current_markup}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Save to temporary file with better error handling
-        import tempfile
-        import os
+        creative = self.selected_creative
+        prefix = _DISPLAY_HTML_PREFIX.format(
+            size=html.escape(str(creative['size'])) if creative else 'Unknown',
+            creative_id=html.escape(str(creative['id'])) if creative else 'Unknown',
+            creative_type=html.escape(self.current_type)
+        )
         
         try:
-            # Create temporary file in system temp directory
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                temp_file = f.name
+            # Overwrite the fixed preview file rather than leaking a new temp file
+            with open(self._preview_path, 'w', encoding='utf-8') as f:
+                f.write(prefix)
+                f.write(self.current_markup)
+                f.write(_DISPLAY_HTML_SUFFIX)
             
-            print(f"📄 Created display preview file: {temp_file}")
-            print(f"📄 File size: {os.path.getsize(temp_file)} bytes")
+            print(f"📄 Wrote display preview file: {self._preview_path}")
             
             # Open in external browser
-            file_url = f"file://{os.path.abspath(temp_file)}"
+            file_url = f"file://{self._preview_path}"
             print(f"🌐 Opening URL: {file_url}")
             webbrowser.open(file_url)
             
@@ -1925,9 +2470,24 @@ Raw Size: {self.selected_creative['size']}"""
             messagebox.showwarning("Warning", "No VAST markup to preview!")
             return
         
-        # Extract VAST URL and click-through
-        vast_url = self.extract_vast_url(self.current_markup)
-        click_through_url = self.extract_vast_click_through(self.current_markup)
+        # Walk the VAST chain off the UI thread; previews of several
+        # creatives can resolve at the same time
+        markup = self.current_markup
+        future = self._vast_executor.submit(self.extract_vast_urls, markup)
+        future.add_done_callback(lambda f: self.root.after(0, self._on_vast_resolved, markup, f))
+    
+    def _on_vast_resolved(self, markup, future):
+        """Build the VAST preview once its video and click-through URLs are known"""
+        if markup is not self.current_markup:
+            print("⚠️ Selection changed while resolving VAST, skipping preview")
+            return
+        
+        try:
+            vast_url, click_through_url = future.result()
+        except Exception as e:
+            print(f"❌ Error resolving VAST: {e}")
+            messagebox.showerror("Error", f"Could not resolve VAST: {e}")
+            return
         
         if not vast_url:
             messagebox.showwarning("Warning", "No VAST URL found!")
@@ -1935,297 +2495,32 @@ Raw Size: {self.selected_creative['size']}"""
         
         # Create HTML content for VAST preview
         # Extract companion ad info
-        companion_info = self._extract_companion_ad_info(self.current_markup)
-        
-        html_content = f"""
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>VAST Video Preview</title>
-            <style>
-                body {{ 
-                    margin: 0; 
-                    padding: 20px; 
-                    font-family: Arial, sans-serif; 
-                    background: #f5f5f5;
-                    font-size: 14px;
-                }}
-                .vast-container {{ 
-                    border: 2px solid #ddd; 
-                    border-radius: 8px;
-                    padding: 30px; 
-                    background: white;
-                    text-align: center;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    max-width: 95vw;
-                    width: 100%;
-                    margin: 0 auto;
-                    box-sizing: border-box;
-                }}
-                .vast-player {{
-                    max-width: 100%;
-                    margin: 20px auto;
-                    text-align: center;
-                }}
-                .video-container {{
-                    width: 100%;
-                    max-width: 100%;
-                    margin: 0 auto;
-                    overflow: hidden;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                    position: relative;
-                }}
-                .video-container video {{
-                    width: 100%;
-                    height: auto;
-                    object-fit: contain;
-                    display: block;
-                }}
-                .video-container.portrait {{
-                    max-width: 400px;
-                    margin: 20px auto;
-                }}
-                .video-container.portrait video {{
-                    max-width: 400px;
-                    max-height: 600px;
-                    width: auto;
-                    height: auto;
-                }}
-                .video-container.landscape {{
-                    max-width: 100%;
-                    margin: 20px auto;
-                    aspect-ratio: 16/9;
-                }}
-                .video-container.landscape video {{
-                    width: 100%;
-                    height: 100%;
-                    max-height: 70vh;
-                    object-fit: contain;
-                }}
-                /* Responsive design for different screen sizes */
-                @media (min-width: 1200px) {{
-                    .video-container.landscape {{
-                        max-width: 1000px;
-                        aspect-ratio: 16/9;
-                    }}
-                }}
-                @media (min-width: 768px) and (max-width: 1199px) {{
-                    .video-container.landscape {{
-                        max-width: 90vw;
-                        aspect-ratio: 16/9;
-                    }}
-                }}
-                @media (max-width: 767px) {{
-                    .video-container.landscape {{
-                        max-width: 95vw;
-                        aspect-ratio: 16/9;
-                    }}
-                    .video-container.portrait {{
-                        max-width: 300px;
-                    }}
-                }}
-                .url-section {{
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    gap: 15px;
-                    margin: 20px 0;
-                }}
-                .vast-url {{
-                    background: #f8f9fa;
-                    border: 1px solid #dee2e6;
-                    border-radius: 8px;
-                    padding: 15px;
-                    font-family: monospace;
-                    word-break: break-all;
-                    text-align: left;
-                    font-size: 11px;
-                    position: relative;
-                    min-height: 80px;
-                }}
-                .vast-url.single {{
-                    grid-column: 1 / -1;
-                }}
-                @media (max-width: 768px) {{
-                    .url-section {{
-                        grid-template-columns: 1fr;
-                    }}
-                }}
-                .copy-button {{
-                    position: absolute;
-                    top: 5px;
-                    right: 5px;
-                    background: #007bff;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-size: 10px;
-                    cursor: pointer;
-                }}
-                .copy-button:hover {{
-                    background: #0056b3;
-                }}
-                .preview-header {{
-                    background: #28a745;
-                    color: white;
-                    padding: 15px 25px;
-                    margin: -30px -30px 25px -30px;
-                    border-radius: 6px 6px 0 0;
-                    font-weight: bold;
-                    font-size: 18px;
-                }}
-                .info-panel {{
-                    background: #e9ecef;
-                    border: 1px solid #dee2e6;
-                    border-radius: 6px;
-                    padding: 15px;
-                    margin: 15px 0;
-                    font-size: 14px;
-                    color: #495057;
-                }}
-                .companion-section {{
-                    margin-top: 20px;
-                    border-top: 2px solid #dee2e6;
-                    padding-top: 20px;
-                }}
-                .companion-ad {{
-                    border: 1px solid #ccc;
-                    margin: 10px auto;
-                    max-width: 300px;
-                    background: white;
-                }}
-                .button-row {{
-                    display: flex;
-                    gap: 10px;
-                    justify-content: center;
-                    margin: 15px 0;
-                    flex-wrap: wrap;
-                }}
-                .action-button {{
-                    background: #6c757d;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    font-size: 12px;
-                    cursor: pointer;
-                    text-decoration: none;
-                    display: inline-block;
-                }}
-                .action-button:hover {{
-                    background: #545b62;
-                }}
-                .action-button.primary {{
-                    background: #007bff;
-                }}
-                .action-button.primary:hover {{
-                    background: #0056b3;
-                }}
-            </style>
-            <script>
-                function copyToClipboard(text) {{
-                    navigator.clipboard.writeText(text).then(function() {{
-                        // Show a brief "Copied!" message
-                        const button = event.target;
-                        const originalText = button.textContent;
-                        button.textContent = 'Copied!';
-                        button.style.background = '#28a745';
-                        setTimeout(function() {{
-                            button.textContent = originalText;
-                            button.style.background = '#007bff';
-                        }}, 1000);
-                    }});
-                }}
-                
-                // Responsive video sizing
-                function resizeVideo() {{
-                    const videoContainer = document.querySelector('.video-container.landscape');
-                    const video = videoContainer ? videoContainer.querySelector('video') : null;
-                    
-                    if (video && videoContainer) {{
-                        const containerWidth = videoContainer.offsetWidth;
-                        const aspectRatio = 16/9;
-                        const calculatedHeight = containerWidth / aspectRatio;
-                        
-                        // Set max height to 70% of viewport height
-                        const maxHeight = window.innerHeight * 0.7;
-                        const finalHeight = Math.min(calculatedHeight, maxHeight);
-                        
-                        videoContainer.style.height = finalHeight + 'px';
-                        video.style.height = '100%';
-                        video.style.width = '100%';
-                    }}
-                }}
-                
-                // Initialize and handle window resize
-                window.addEventListener('load', resizeVideo);
-                window.addEventListener('resize', resizeVideo);
-                
-                // Also resize when video loads
-                document.addEventListener('DOMContentLoaded', function() {{
-                    const video = document.querySelector('video');
-                    if (video) {{
-                        video.addEventListener('loadedmetadata', resizeVideo);
-                    }}
-                }});
-            </script>
-        </head>
-        <body>
-            <div class="vast-container">
-                <div class="preview-header">
-                    🎬 VAST Video Ad Player - {self.selected_creative['size'] if self.selected_creative else 'Unknown'}
-                </div>
-                <div class="info-panel">
-                    <strong>Creative Info:</strong> ID: {self.selected_creative['id'] if self.selected_creative else 'Unknown'}, 
-                    Size: {self.selected_creative['size'] if self.selected_creative else 'Unknown'}, Type: {self.current_type}
-                </div>
-                
-
-                
-                <div class="vast-player">
-                    <div class="video-container{' portrait' if self._is_portrait_video() else ' landscape'}">
-                        <video controls>
-                            <source src="{vast_url}" type="video/mp4">
-                            <source src="{vast_url}" type="video/webm">
-                            <source src="{vast_url}" type="video/ogg">
-                            Your browser does not support the video tag.
-                        </video>
-                    </div>
-                </div>
-                
-                <div class="url-section">
-                    <div class="vast-url{' single' if not click_through_url else ""}">
-                        <button class="copy-button" onclick="copyToClipboard('{vast_url}')">Copy</button>
-                        <strong>🎯 Video URL:</strong><br>
-                        {vast_url}
-                    </div>
-                    
-                </div>
-                
-                {companion_info['html'] if companion_info['found'] else '<div class="companion-section"><h3>🖼️ Companion Ads</h3><p>No Companion</p></div>'}
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Save to temporary file with better error handling
-        import tempfile
-        import os
+        companion_info = self._companion_ad_info(self.current_markup)
+        
+        creative = self.selected_creative
+        # Ad server URLs and IDs are untrusted, so escape everything but the companion HTML
+        html_body = _VAST_HTML_BODY_TMPL.substitute(
+            size=html.escape(str(creative['size'])) if creative else 'Unknown',
+            creative_id=html.escape(str(creative['id'])) if creative else 'Unknown',
+            creative_type=html.escape(self.current_type),
+            orientation='portrait' if self._is_portrait_video() else 'landscape',
+            url_class='' if click_through_url else ' single',
+            vast_url=html.escape(vast_url),
+            vast_url_js=_js_attr(vast_url),
+            companion_html=companion_info['html'] if companion_info['found'] else '<div class="companion-section"><h3>🖼️ Companion Ads</h3><p>No Companion</p></div>'
+        )
         
         try:
-            # Create temporary file in system temp directory
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                temp_file = f.name
+            # Overwrite the fixed preview file rather than leaking a new temp file
+            with open(self._vast_preview_path, 'wb') as f:
+                f.write(_VAST_HTML_HEAD)
+                f.write(html_body.encode('utf-8'))
             
-            print(f"📄 Created VAST preview file: {temp_file}")
-            print(f"📄 File size: {os.path.getsize(temp_file)} bytes")
+            print(f"📄 Wrote VAST preview file: {self._vast_preview_path}")
             print(f"🎬 Video URL: {vast_url}")
             
             # Open in external browser
-            file_url = f"file://{os.path.abspath(temp_file)}"
+            file_url = f"file://{self._vast_preview_path}"
             print(f"🌐 Opening URL: {file_url}")
             webbrowser.open(file_url)
             
@@ -2233,78 +2528,94 @@ Raw Size: {self.selected_creative['size']}"""
             print(f"❌ Error creating VAST preview: {e}")
             messagebox.showerror("Error", f"Could not create VAST preview: {e}")
     
+    def _remove_preview_files(self):
+        """Delete the preview HTML files written this session"""
+        for path in (self._preview_path, self._vast_preview_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Could not remove preview file {path}: {e}")
+    
+    def _iter_companions(self, markup):
+        """Yield each Companion element as soon as it is parsed, then free its subtree"""
+        # Streaming avoids building the whole VAST tree (tracking pixels and all)
+        # just to read a few companion elements; CDATA is kept as element text
+        source = io.BytesIO(_xml_bytes(markup))
+        if lxml_etree is not None:
+            events = lxml_etree.iterparse(source, events=('end',), tag='Companion',
+                                          resolve_entities=False, no_network=True)
+        else:
+            events = (event for event in ET.iterparse(source, events=('end',)) if event[1].tag == 'Companion')
+        
+        for _, companion in events:
+            yield companion
+            companion.clear()
+    
     def _extract_companion_ad_info(self, markup):
         """Extract companion ad information from VAST markup"""
-        import re
-        from xml.etree import ElementTree as ET
-        
         try:
-            # Clean up the markup first (remove CDATA if present)
-            clean_markup = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', markup)
-            
-            # Parse as XML
-            root = ET.fromstring(clean_markup)
-            
-            # Look for CompanionAds
-            companion_ads = root.findall('.//Companion')
-            
-            if not companion_ads:
-                return {'found': False, 'html': ''}
-            
-            companion_html = """
+            parts = ["""
             <div class="companion-section">
                 <h3>🖼️ Companion Ads</h3>
-            """
+            """]
             
-            for i, companion in enumerate(companion_ads):
-                companion_id = companion.get('id', f'companion_{i}')
-                width = companion.get('width', 'Unknown')
-                height = companion.get('height', 'Unknown')
+            for i, companion in enumerate(self._iter_companions(markup)):
+                companion_id = html.escape(companion.get('id', f'companion_{i}'))
+                width = html.escape(companion.get('width', 'Unknown'))
+                height = html.escape(companion.get('height', 'Unknown'))
                 
-                # Find StaticResource (image)
-                static_resource = companion.find('.//StaticResource')
-                image_url = static_resource.text.strip() if static_resource is not None and static_resource.text else None
-                
-                # Find CompanionClickThrough
-                click_through = companion.find('.//CompanionClickThrough')
-                click_url = click_through.text.strip() if click_through is not None and click_through.text else None
+                # Find StaticResource (image) and CompanionClickThrough
+                if lxml_etree is not None:
+                    image_url = _first_text(_STATIC_RESOURCE_XPATH(companion))
+                    click_url = _first_text(_COMPANION_CLICK_XPATH(companion))
+                else:
+                    static_resource = companion.find('.//StaticResource')
+                    image_url = static_resource.text.strip() if static_resource is not None and static_resource.text else None
+                    
+                    click_through = companion.find('.//CompanionClickThrough')
+                    click_url = click_through.text.strip() if click_through is not None and click_through.text else None
                 
-                companion_html += f"""
+                parts.append(f"""
                 <div class="companion-ad">
                     <div style="padding: 10px; border-bottom: 1px solid #dee2e6;">
                         <strong>Companion Ad {i+1}</strong> (ID: {companion_id})<br>
                         Size: {width}x{height}
                     </div>
-                """
+                """)
                 
                 if image_url:
-                    companion_html += f"""
+                    parts.append(f"""
                     <div style="padding: 10px;">
-                        <img src="{image_url}" style="max-width: 100%; height: auto; border: 1px solid #ddd;" alt="Companion Ad">
+                        <img src="{html.escape(image_url)}" style="max-width: 100%; height: auto; border: 1px solid #ddd;" alt="Companion Ad">
                         <div class="vast-url" style="margin-top: 10px;">
-                            <button class="copy-button" onclick="copyToClipboard('{image_url}')">Copy</button>
+                            <button class="copy-button" onclick="copyToClipboard({_js_attr(image_url)})">Copy</button>
                             <strong>🖼️ Image URL:</strong><br>
-                            {image_url}
+                            {html.escape(image_url)}
                         </div>
                     </div>
-                    """
+                    """)
                 
                 if click_url:
-                    companion_html += f"""
+                    parts.append(f"""
                     <div class="vast-url" style="margin: 10px;">
-                        <button class="copy-button" onclick="copyToClipboard('{click_url}')">Copy</button>
+                        <button class="copy-button" onclick="copyToClipboard({_js_attr(click_url)})">Copy</button>
                         <strong>🔗 Click URL:</strong><br>
-                        {click_url}
+                        {html.escape(click_url)}
                     </div>
-                    """
+                    """)
                 
-                companion_html += "</div>"
+                parts.append("</div>")
             
-            companion_html += "</div>"
+            if len(parts) == 1:  # Just the section header, no companions
+                return {'found': False, 'html': ''}
             
-            return {'found': True, 'html': companion_html}
+            parts.append("</div>")
             
-        except ET.ParseError as e:
+            return {'found': True, 'html': ''.join(parts)}
+            
+        except SyntaxError as e:  # ET.ParseError and lxml's XMLSyntaxError
             print(f"❌ Error parsing VAST for companion ads: {e}")
             return {'found': False, 'html': ''}
         except Exception as e:
@@ -2313,19 +2624,7 @@ Raw Size: {self.selected_creative['size']}"""
     
     def _is_portrait_video(self):
         """Check if the video is portrait orientation"""
-        if not self.selected_creative:
-            return False
-        
-        size = self.selected_creative['size']
-        if 'x' in size:
-            try:
-                width, height = size.split('x')
-                w, h = int(width), int(height)
-                # Portrait if height > width OR if it's a mobile-style video (like 480x320)
-                return h > w or (w <= 480 and h <= 640)
-            except ValueError:
-                return False
-        return False
+        return bool(self.selected_creative and self.selected_creative['portrait'])
     
     def copy_markup(self):
         """Copy markup to clipboard"""
@@ -2602,7 +2901,7 @@ Raw Size: {self.selected_creative['size']}"""
 
             try:
                 self.save_token_to_config(new_token)
-                self.access_token = new_token # Update token in current session
+                self._set_access_token(new_token) # Update token in current session
                 messagebox.showinfo("Success", "Databricks token updated successfully.\nChanges will be fully applied on next app start.")
                 refresh_databricks_display()
                 token_var.set("")
@@ -2618,80 +2917,71 @@ Raw Size: {self.selected_creative['size']}"""
             messagebox.showwarning("Warning", "No markup to format!")
             return
         
+        # Parsing large markup would freeze the UI, so format in the background
+        self.beautify_small_button.config(state='disabled')
+        thread = threading.Thread(target=self._beautify_worker, args=(self.current_markup,), daemon=True)
+        thread.start()
+    
+    def _beautify_worker(self, src):
+        """Format markup in background thread"""
         try:
-            import xml.etree.ElementTree as ET
-            import re
-            
-            # Clean up the markup first (remove CDATA if present)
-            clean_markup = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', self.current_markup)
-            
-            # Try to parse as XML
-            try:
-                root = ET.fromstring(clean_markup)
-                formatted_xml = self._format_xml_element(root, 0)
-            except ET.ParseError:
-                # If XML parsing fails, use simple formatting
-                formatted_xml = self._simple_format_xml(self.current_markup)
-            
-            # Update the markup text area
-            self.markup_text.delete(1.0, tk.END)
-            self.markup_text.insert(1.0, formatted_xml)
+            formatted_xml = self._formatted_markup(src)
+            self.root.after(0, self._replace_markup, src, formatted_xml)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to format XML: {str(e)}")
+            error_msg = f"Failed to format XML: {str(e)}"
+            self.root.after(0, self._beautify_failed, error_msg)
     
-    def _format_xml_element(self, element, indent_level):
-        """Recursively format XML element with proper indentation"""
-        spaces = "    " * indent_level
-        result = ""
-        
-        # Start tag with attributes
-        result += spaces + "<" + element.tag
+    def _format_markup(self, src):
+        """Pretty-print markup, falling back to simple formatting if it isn't valid XML"""
+        # Clean up the markup first (remove CDATA if present)
+        clean_markup = _CDATA_RE.sub(r'\1', src)
         
-        # Add attributes
-        for key, value in element.attrib.items():
-            result += f' {key}="{value}"'
-        
-        # Check if element has children
-        children = list(element)
-        text_content = element.text.strip() if element.text else ""
+        # Try to parse as XML (lxml and ElementTree parse errors are SyntaxErrors)
+        try:
+            return self._pretty_print_xml(clean_markup)
+        except (SyntaxError, ValueError):
+            # If XML parsing fails, use simple formatting
+            return self._simple_format_xml(clean_markup)
+    
+    def _replace_markup(self, src, formatted_xml):
+        """Show formatted markup unless another creative was selected meanwhile"""
+        self.beautify_small_button.config(state='normal')
+        if src is not self.current_markup:
+            return
         
-        if children or (text_content and len(children) > 0):
-            # Element has children or mixed content
-            result += ">\n"
-            
-            # Add text content if present
-            if text_content:
-                result += spaces + "    " + text_content + "\n"
-            
-            # Add child elements
-            for child in children:
-                result += self._format_xml_element(child, indent_level + 1) + "\n"
-            
-            result += spaces + "</" + element.tag + ">"
-        elif text_content:
-            # Element has only text content
-            result += ">" + text_content + "</" + element.tag + ">"
-        else:
-            # Self-closing element
-            result += "/>"
+        # Update the markup text area
+        self._show_markup_text(formatted_xml)
+    
+    def _show_markup_text(self, text):
+        """Show markup in the text area, truncated to MARKUP_DISPLAY_LIMIT characters"""
+        text = text or ""
+        if len(text) > MARKUP_DISPLAY_LIMIT:
+            text = f"{text[:MARKUP_DISPLAY_LIMIT]}\n\n--- TRUNCATED ({len(text)} characters total, use Preview to render the full creative) ---"
+        self.markup_text.replace(1.0, tk.END, text)
+    
+    def _beautify_failed(self, error_msg):
+        """Handle formatting error"""
+        self.beautify_small_button.config(state='normal')
+        messagebox.showerror("Error", error_msg)
+    
+    def _pretty_print_xml(self, xml_string):
+        """Pretty-print XML with 4-space indentation"""
+        if lxml_etree is not None:
+            root = lxml_etree.fromstring(_xml_bytes(xml_string), _PRETTY_XML_PARSER)
+            lxml_etree.indent(root, space='    ')
+            return lxml_etree.tostring(root, encoding='unicode')
         
-        return result
+        root = ET.fromstring(xml_string)
+        ET.indent(root, space='    ')
+        return ET.tostring(root, encoding='unicode')
     
     def _simple_format_xml(self, xml_string):
-        """Simple XML formatting fallback"""
-        # Clean up CDATA sections first
-        xml_string = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', xml_string)
-        
-        # Add line breaks after tags
-        xml_string = xml_string.replace('>', '>\n')
-        xml_string = xml_string.replace('<', '\n<')
-        
-        # Clean up multiple line breaks
-        xml_string = re.sub(r'\n\n+', '\n', xml_string)
+        """Simple XML formatting fallback for markup already stripped of CDATA"""
+        # Break lines before and after every tag in a single pass
+        lines = _TAG_BREAK_RE.split(xml_string)
         
         # Add indentation
-        lines = xml_string.split('\n')
         indent_level = 0
         result = []
         
@@ -2705,7 +2995,8 @@ Raw Size: {self.selected_creative['size']}"""
             
             result.append("    " * indent_level + line)
             
-            if line.startswith('<') and not line.startswith('</') and not line.endswith('/>'):
+            # Declarations, comments and processing instructions don't open an element
+            if line[0] == '<' and line[1:2] not in ('/', '?', '!') and not line.endswith('/>'):
                 indent_level += 1
         
         return '\n'.join(result)
@@ -2716,7 +3007,6 @@ Raw Size: {self.selected_creative['size']}"""
         """Load Databricks access token from config file or prompt user"""
         try:
             # First, try to load from config file - check multiple locations
-            config = configparser.ConfigParser()
             config_paths = [
                 "config.ini",  # Current directory
                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini"),  # Script directory
@@ -2728,7 +3018,7 @@ Raw Size: {self.selected_creative['size']}"""
                 print(f"🔍 Checking for config at: {config_path}")
                 if os.path.exists(config_path):
                     print(f"✅ Found config file at: {config_path}")
-                    config.read(config_path)
+                    config = self._read_config(config_path)
                     if config.has_section("DATABRICKS") and config.has_option("DATABRICKS", "access_token"):
                         saved_token = config.get("DATABRICKS", "access_token")
                         if saved_token and saved_token.startswith("dapi") and len(saved_token.strip()) > 20:
@@ -2756,6 +3046,19 @@ Raw Size: {self.selected_creative['size']}"""
             messagebox.showerror("Configuration Error", f"Failed to load configuration: {str(e)}")
             sys.exit(1)
     
+    def _read_config(self, config_path):
+        """Parse a config file, reusing the last parse while its mtime is unchanged"""
+        config_path = os.path.abspath(config_path)
+        mtime = os.stat(config_path).st_mtime
+        cached = self._config_cache.get(config_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self._config_cache[config_path] = (mtime, config)
+        return config
+    
     def prompt_for_token(self):
         """Prompt user to enter Databricks token"""
         from tkinter import simpledialog
@@ -2866,10 +3169,8 @@ Raw Size: {self.selected_creative['size']}"""
     def save_token_to_config(self, token):
         """Save token to config.ini file"""
         try:
-            config = configparser.ConfigParser()
-            
             # Try to read existing config from multiple locations
-            config_read = False
+            config = None
             config_paths = [
                 "config.ini",  # Current directory
                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini"),  # Script directory
@@ -2879,11 +3180,15 @@ Raw Size: {self.selected_creative['size']}"""
             
             for config_path in config_paths:
                 if os.path.exists(config_path):
-                    config.read(config_path)
-                    config_read = True
+                    # Usually already parsed by load_configuration. Edit a copy so a
+                    # failed write doesn't leave the token in the cached parse.
+                    config = copy.deepcopy(self._read_config(config_path))
                     print(f"✅ Reading existing config from: {config_path}")
                     break
             
+            if config is None:
+                config = configparser.ConfigParser()
+            
             # Add/update DATABRICKS section
             if not config.has_section('DATABRICKS'):
                 config.add_section('DATABRICKS')
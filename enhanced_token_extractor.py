@@ -173,8 +173,8 @@ class EnhancedTokenExtractor:
             ]
             
             for pattern in code_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
+                for code_match in re.finditer(pattern, text):
+                    match = code_match.group(1)
                     if len(match) > 10:  # Likely a real auth code
                         logger.info(f"🔍 Found auth code with pattern: {match[:10]}...")
                         return match
@@ -336,9 +336,8 @@ class EnhancedTokenExtractor:
             
             # Pattern 1: JWT token in script tags
             jwt_pattern = r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*'
-            jwt_matches = re.findall(jwt_pattern, text)
-            
-            for match in jwt_matches:
+            for jwt_match in re.finditer(jwt_pattern, text):
+                match = jwt_match.group(0)
                 if len(match) > 100:  # Likely a real JWT
                     logger.info(f"🔍 Found JWT token in response: {match[:20]}...")
                     return match
@@ -352,8 +351,8 @@ class EnhancedTokenExtractor:
             ]
             
             for pattern in token_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
+                for token_match in re.finditer(pattern, text):
+                    match = token_match.group(1)
                     if match.startswith('eyJ') and len(match) > 100:
                         logger.info(f"🔍 Found token with pattern: {match[:20]}...")
                         return match